@@ -1,14 +1,37 @@
 # Written by: Shunnosuke Takei
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from compact_network import CompactFlowNetwork
+from components import split_components
+from day_decomposition import seed_days
+from demand import check_overrides, shortfall
+from feasibility import precheck as run_precheck
 from flow_network import FlowNetwork
+from interrupt import SolveInterrupted
+from pruning import prune_problem
+from solver_stats import SolverStats
 
-def allocate(preferences, officers_per_org, min_shifts, max_shifts):
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+ENGINES = {"object": FlowNetwork, "compact": CompactFlowNetwork}
+OUTPUTS = ("nested", "dense", "sparse")
+SOLVERS = {"fordfulkerson": "FordFulkerson", "dinic": "Dinic", "pushrelabel": "PushRelabel", "mincost": "MinCostFlow"}
+
+def allocate(preferences, officers_per_org, min_shifts, max_shifts, engine=None, solver="fordfulkerson", warm_start=False,
+             report=None, decompose_days=False, workers=None, aggregate=False, output="nested",
+             precheck=True, observer=None, days=30, shift_requirements=None, officer_bounds=None, weights=None,
+             fairness=0, cache=None, store=None, should_stop=None, partial=False, unavailable=None, prune=False,
+             split=False):
     """
     Allocates shifts to officers based on their preferences and the number of officers required for each shift in each company
     
     Written by: Shunnosuke Takei
 
     Approach:
-        My approach was to create a flow network for the given inputs, consisting of officer nodes, allocation nodes and shift nodes. Each officer will have 30 allocation nodes, one for each day, which will have edges
+        My approach was to create a flow network for the given inputs, consisting of officer nodes, allocation nodes and shift nodes. Each officer will have one allocation node for each day, which will have edges
         connecting to the shift nodes based on the officer's preferences. The shift nodes will have edges connecting to the sink node based on the number of officers required for each shift in each company. The network
         will also have a source node with edges connecting to the officer nodes based on the minimum and maximum number of shifts an officer can work. Another source node will be created to resolve the demand of the source
         node, which will always be -(total number of shifts required). Next, a residual network is created for the flow network, which will be used to run the Ford Fulkerson algorithm. The Ford Fulkerson algorithm will find
@@ -21,11 +44,79 @@ def allocate(preferences, officers_per_org, min_shifts, max_shifts):
     Input:
         preferences: A 2D array where each subarray contains the preferences of an officer
         officers_per_org: A 2D array where each subarray contains the number of officers required for each shift in a company
+                          The number of shifts per day is the length of these subarrays (3 if both arrays are empty)
         min_shifts: The minimum number of shifts an officer can work
         max_shifts: The maximum number of shifts an officer can work
+        engine: "object" builds the network out of Node/Edge objects (FlowNetwork), "compact" stores it in flat arrays
+                (CompactFlowNetwork). Both engines find the same augmenting paths and return identical output.
+                Defaults to "object" unless the other options need the compact engine
+        solver: The max flow algorithm, one of "fordfulkerson", "dinic", "pushrelabel" or "mincost". Only
+                "fordfulkerson" is available on the object engine. Every solver returns a valid allocation, but not
+                necessarily the same one. "mincost" returns the allocation of least cost under weights and fairness,
+                starting from the flow seeded by warm_start or decompose_days if given
+        warm_start: If True, seed the network with a greedy allocation before running the solver, so the solver only
+                    needs to augment the remaining deficit
+        report: An optional dictionary that is filled in with details of the run:
+                    seeded_flow: The flow seeded by the warm start or the day decomposition (0 without either)
+                    augmented_flow: The flow added by the solver (None if should_stop stopped a partial solve)
+                    cost: The cost of the allocation (the "mincost" solver only)
+                    infeasible: Only when None is returned, the failed check of feasibility.precheck (with stage
+                                "precheck"), or the min cut explanation of FlowNetwork.min_cut (with stage "solve")
+                    stats: SolverStats.as_dict() of the run: augmenting paths, path lengths, nodes and edges scanned
+                           by the searches, and the time spent building, seeding, creating the residual network,
+                           augmenting and building the output
+        decompose_days: If True, solve every day on its own across a process pool and seed the merged result before
+                        running the solver, which then only reconciles the officers' maximum shifts (compact engine)
+        workers: The number of worker processes for decompose_days and split, defaults to the number of CPUs
+        aggregate: If True, solve on one shift node per (day, shift) shared by every company and split the flow over the
+                   companies afterwards, which makes the network M times smaller (compact engine)
+        output: The format of the result:
+                    "nested": A 4D list [i][j][k][l] where i is the officer, j is the company, k is the day, and l is the shift
+                              The value at [i][j][k][l] is 1 if the officer is allocated to the shift, 0 otherwise
+                    "dense": The same values as a NumPy uint8 array of shape (N, M, days, shifts) (requires NumPy)
+                    "sparse": A list of (officer, company, day, shift) tuples, one per allocated shift
+        precheck: If True, run the O(N + M) necessary conditions of feasibility.precheck first and return None without
+                  building the network when one fails
+        observer: An optional function called with the SolverStats of the run once it has finished. Stats are only
+                  collected when report or observer is given
+        days: The number of days in the roster, the network and the output are sized to it
+        shift_requirements: An optional dictionary mapping (company, day, shift) to the number of officers required on
+                            that day. Only the entries that differ from officers_per_org need to be given, every other
+                            day keeps the requirement of officers_per_org
+        officer_bounds: An optional dictionary mapping an officer to their (min_shifts, max_shifts). Officers without
+                        an entry keep min_shifts and max_shifts
+        weights: An optional 2D array of integers where weights[i][shift] is how much officer i wants the shift, higher
+                 is better (the "mincost" solver only, see CompactFlowNetwork.set_costs)
+        fairness: An integer cost added for every further shift an officer works above their minimum, which spreads
+                  the workload evenly (the "mincost" solver only)
+        cache: An optional TopologyCache. A network built for the same preferences, company count, days and shifts is
+               reset and reused instead of being built again (compact engine)
+        store: An optional SolutionStore. If it holds the result of the same inputs and options, that result is
+               returned without solving (report then only gets store: "hit", and observer is not called), otherwise
+               the result of the solve is added to it (report gets store: "miss")
+        should_stop: An optional function the solver calls between augmentations (see interrupt.StopCheck for a
+                     deadline or an event). Once it returns True the solve stops and interrupt.SolveInterrupted is
+                     raised, nothing is added to the store
+        partial: If True, return the best allocation found instead of None when the requirements cannot all be met:
+                 the maximum coverage, or the flow found so far when should_stop stops the solve (which then does not
+                 raise). The precheck is skipped, as it would only reject inputs a partial allocation can still serve
+        unavailable: An optional iterable of (officer, day) pairs the officer cannot work, read once into a sorted
+                     tuple so that iterators work and the order of the pairs does not change the store key
+        prune: If True, solve only the core left by pruning.prune_problem: companies, days, shifts and officers that
+               cannot take part are dropped and forced assignments are fixed beforehand, then the allocation of the core
+               is mapped back to the full output (requires NumPy). report gets "pruned" with the size of the core, and
+               its min cut explanation is given in full indices. When every assignment is forced nothing is solved, so
+               the flows are 0, the stats are empty and observer gets an empty SolverStats
+        split: If True, split the problem into the connected components of the officer to shift preference graph (see
+               components.split_components), precheck every component, and solve them in parallel across a process
+               pool of workers processes (in this process if workers is 1). should_stop must then be picklable, such as
+               an interrupt.StopCheck, and cache is not used when there is more than one component. report gets
+               "components", the report of every component solve, and its flows, cost and stats are the totals over
+               the components (the timings add up the time of every process)
     Return:
-        A 4D array [i][j][k][l] where i is the officer, j is the company, k is the day, and l is the shift
-        The value at [i][j][k][l] is 1 if the officer is allocated to the shift, 0 otherwise
+        The allocation in the requested output format, or None if the allocation is invalid
+        With partial, a tuple (allocation, shortfall) where shortfall is the report of demand.shortfall (the unmet
+        shifts and the officers below their minimum) with "stopped": the reason should_stop gave, or None
         
     Time complexity:
         Best case analysis: O(M * N^2) where N is the number of officers and M is the number of companies
@@ -34,25 +125,412 @@ def allocate(preferences, officers_per_org, min_shifts, max_shifts):
         Input space analysis: O(N + M) where N is the number of officers and M is the number of companies
         Aux space analysis: O(2(N * M)) = O(N * M) where N is the number of officers and M is the number of companies
     """
-    fn = FlowNetwork(preferences, officers_per_org, min_shifts, max_shifts)
-    fn.FordFulkerson()
-    for node in fn.shift_nodes:
-        for day in node:
-            for shift in day:
-                if shift.req != shift.edges[0].flow:
+    if solver not in SOLVERS:
+        raise ValueError("Unknown solver: " + str(solver))
+    if output not in OUTPUTS:
+        raise ValueError("Unknown output format: " + str(output))
+    if (weights is not None or fairness) and solver != "mincost":
+        raise ValueError("weights and fairness need the mincost solver")
+    # Options that are only implemented on the compact engine
+    compact_options = []
+    if solver != "fordfulkerson":
+        compact_options.append("solver=" + solver)
+    if decompose_days:
+        compact_options.append("decompose_days")
+    if aggregate:
+        compact_options.append("aggregate")
+    if cache is not None:
+        compact_options.append("cache")
+    if engine is None:
+        engine = "compact" if compact_options else "object"
+    if engine not in ENGINES:
+        raise ValueError("Unknown engine: " + str(engine))
+    if engine == "object" and compact_options:
+        raise ValueError("The compact engine is required for: " + ", ".join(compact_options))
+    shifts = shift_count(preferences, officers_per_org)
+    if unavailable is not None:
+        unavailable = tuple(sorted(set(map(tuple, unavailable))))
+    check_overrides(len(preferences), len(officers_per_org), days, shifts, shift_requirements, officer_bounds,
+                    unavailable)
+    overrides = {"shift_requirements": shift_requirements, "officer_bounds": officer_bounds}
+
+    if store is not None:
+        key = store.key(preferences, officers_per_org, min_shifts, max_shifts, days=days, engine=engine, solver=solver,
+                        warm_start=warm_start, decompose_days=decompose_days, aggregate=aggregate, weights=weights,
+                        fairness=fairness, unavailable=unavailable, prune=prune, split=split, **overrides)
+        stored = store.get(key)
+        if partial and stored is not None and stored[1] is None:
+            # Only complete allocations are stored, the best partial one has to be solved for
+            stored = None
+        if report is not None:
+            report["store"] = "miss" if stored is None else "hit"
+        if stored is not None:
+            shape, assignments = stored
+            if assignments is None:
+                return None
+            result = build_output(assignments, shape[0], shape[1], output, days, shifts)
+            if partial:
+                missing = shortfall(assignments, len(preferences), officers_per_org, min_shifts, days, shifts,
+                                    shift_requirements, officer_bounds)
+                missing["stopped"] = None
+                return result, missing
+            return result
+
+    if precheck and not partial:
+        failed = run_precheck(preferences, officers_per_org, min_shifts, max_shifts, days, shifts,
+                              unavailable=unavailable, **overrides)
+        if failed is not None:
+            if report is not None:
+                failed["stage"] = "precheck"
+                report["infeasible"] = failed
+            return None
+
+    parts = split_components(preferences, officers_per_org, days, shifts, shift_requirements, officer_bounds,
+                             unavailable) if split else None
+    if parts is not None and len(parts) > 1:
+        if precheck and not partial:
+            for index, part in enumerate(parts):
+                failed = run_precheck(part.preferences, part.officers_per_org, min_shifts, max_shifts, days,
+                                      len(part.shift_index), part.shift_requirements, part.officer_bounds,
+                                      part.unavailable)
+                if failed is not None:
+                    if report is not None:
+                        failed["stage"] = "precheck"
+                        failed["component"] = index
+                        failed["shifts"] = part.shift_index
+                        report["infeasible"] = failed
                     return None
-    output = [[]]*len(preferences)
-    for i in range(len(preferences)):
-        output[i] = [[]]*len(officers_per_org)
-        for j in range(len(officers_per_org)):
-            output[i][j] = [[]]*30
-            for k in range(30):
-                output[i][j][k] = [0, 0, 0]
-    for allocation in fn.allocation_nodes:
-        for day in allocation:
-            for edge in day.edges:
-                if edge.flow == 1:
-                    output[edge.start.officer][edge.end.company][edge.end.day][edge.end.shift] = 1
+        options = {"engine": engine, "solver": solver, "warm_start": warm_start, "decompose_days": decompose_days,
+                   "aggregate": aggregate, "fairness": fairness, "should_stop": should_stop, "partial": partial,
+                   "prune": prune}
+        reporting = report is not None or observer is not None
+        if workers == 1:
+            results = []
+            for part in parts:
+                results.append(solve_component(part, min_shifts, max_shifts, options, weights, reporting))
+                if results[-1][0] is None and not partial:
+                    break
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(solve_component, part, min_shifts, max_shifts, options, weights, reporting)
+                           for part in parts]
+                # One infeasible component makes the whole problem infeasible, so the others are not waited for
+                running = set(futures)
+                while running:
+                    done, running = wait(running, return_when=FIRST_COMPLETED)
+                    if not partial and any(future.result()[0] is None for future in done):
+                        for future in running:
+                            future.cancel()
+                        break
+                results = [future.result() if future.done() and not future.cancelled() else (None, None)
+                           for future in futures]
+
+        assignments = []
+        met = True
+        stopped = None
+        component_reports = []
+        for index, (part, (solved, part_report)) in enumerate(zip(parts, results)):
+            if partial:
+                solved, missing = solved
+                met = met and not missing["unmet_shifts"]
+                stopped = stopped or missing["stopped"]
+            elif solved is None:
+                met = False
+            if solved is not None:
+                assignments.extend(part.expand(solved))
+            if part_report is not None:
+                if "infeasible" in part_report:
+                    part.expand_cut(part_report["infeasible"])
+                    if report is not None and "infeasible" not in report:
+                        report["infeasible"] = dict(part_report["infeasible"], component=index)
+                component_reports.append(part_report)
+        if report is not None:
+            report["components"] = component_reports
+        return merged_result(assignments, met, stopped, preferences, officers_per_org, min_shifts, output, days, shifts,
+                             shift_requirements, officer_bounds, store, key if store is not None else None, partial,
+                             report, solver, weights, fairness, observer, component_reports)
+
+    if prune:
+        # Forcing shifts on officers would change how many shifts above their minimum they work in the core
+        core = prune_problem(preferences, officers_per_org, min_shifts, max_shifts, days, shifts, shift_requirements,
+                             officer_bounds, unavailable, force=not fairness)
+        if report is not None:
+            report["pruned"] = core.summary()
+        assignments = list(core.forced)
+        met = True
+        stopped = None
+        core_reports = []
+        if core.officers_per_org:
+            core_report = {} if report is not None or observer is not None else None
+            solved = allocate(core.preferences, core.officers_per_org, min_shifts, max_shifts, engine=engine,
+                              solver=solver, warm_start=warm_start, report=core_report, decompose_days=decompose_days,
+                              workers=workers, aggregate=aggregate, output="sparse", precheck=False,
+                              days=core.days, shift_requirements=core.shift_requirements,
+                              officer_bounds=core.officer_bounds, weights=core.core_weights(weights),
+                              fairness=fairness, cache=cache, should_stop=should_stop, partial=partial,
+                              unavailable=core.unavailable)
+            if partial:
+                solved, missing = solved
+                met = not missing["unmet_shifts"]
+                stopped = missing["stopped"]
+            else:
+                met = solved is not None
+            if solved is not None:
+                assignments.extend(core.expand(solved))
+            if core_report is not None:
+                if "infeasible" in core_report:
+                    core.expand_cut(core_report["infeasible"])
+                if report is not None:
+                    report.update(core_report)
+                core_reports.append(core_report)
+        return merged_result(assignments, met, stopped, preferences, officers_per_org, min_shifts, output, days, shifts,
+                             shift_requirements, officer_bounds, store, key if store is not None else None, partial,
+                             report, solver, weights, fairness, observer, core_reports)
+
+    stats = SolverStats() if report is not None or observer is not None else None
+    start = time.perf_counter()
+    overrides["unavailable"] = unavailable
+    if solver == "mincost":
+        overrides["weights"] = weights
+        overrides["fairness"] = fairness
+    if cache is not None:
+        fn = cache.network(preferences, officers_per_org, min_shifts, max_shifts, days, shifts, aggregate, **overrides)
+    elif aggregate:
+        fn = CompactFlowNetwork(preferences, officers_per_org, min_shifts, max_shifts, aggregate=True, days=days,
+                                shifts=shifts, **overrides)
+    else:
+        fn = ENGINES[engine](preferences, officers_per_org, min_shifts, max_shifts, days=days, shifts=shifts, **overrides)
+    if stats is not None:
+        fn.stats = stats
+        stats.timings["build"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    seeded = 0
+    if decompose_days:
+        seeded += seed_days(fn, preferences, officers_per_org, workers, days, shift_requirements)
+    if warm_start:
+        seeded += fn.greedy_initial_flow()
+    if stats is not None:
+        stats.timings["seed"] = time.perf_counter() - start
+        # The compact engine builds its residual arrays at the end of its constructor, the object engine builds its
+        # residual network on demand. Residual values are read from the flows of the edges, so seeding before or after
+        # building it gives the same network
+        if isinstance(fn, FlowNetwork):
+            start = time.perf_counter()
+            fn.residual_network()
+            stats.timings["residual"] = time.perf_counter() - start
+        else:
+            stats.timings["build"] -= fn.build_time
+            stats.timings["residual"] = fn.build_time
+
+    start = time.perf_counter()
+    fn.should_stop = should_stop
+    stopped = None
+    try:
+        augmented = getattr(fn, SOLVERS[solver])()
+    except SolveInterrupted as interrupted:
+        if not partial:
+            raise
+        # Every solver leaves a valid flow when it is stopped, keep it as the best one found
+        stopped = interrupted.reason
+        augmented = None
+    if stats is not None:
+        stats.timings["augment"] = time.perf_counter() - start
+    if report is not None:
+        report["seeded_flow"] = seeded
+        report["augmented_flow"] = augmented
+        if solver == "mincost":
+            report["cost"] = fn.flow_cost()
+
+    met = stopped is None and fn.requirements_met()
+    if met or partial:
+        start = time.perf_counter()
+        assignments = fn.assignments() if store is None and not partial else list(fn.assignments())
+        result = build_output(assignments, len(preferences), len(officers_per_org), output, days, shifts)
+        if stats is not None:
+            stats.timings["output"] = time.perf_counter() - start
+    else:
+        assignments = None
+        result = None
+    if not met and stopped is None and report is not None:
+        report["infeasible"] = fn.min_cut()
+        report["infeasible"]["stage"] = "solve"
+    if store is not None and stopped is None:
+        store.put(key, (len(preferences), len(officers_per_org), days, shifts), assignments if met else None)
+    if report is not None:
+        report["stats"] = stats.as_dict()
+    if observer is not None:
+        observer(stats)
+    if partial:
+        missing = shortfall(assignments, len(preferences), officers_per_org, min_shifts, days, shifts,
+                            shift_requirements, officer_bounds)
+        missing["stopped"] = stopped
+        return result, missing
+    return result
+
+
+def solve_component(part, min_shifts, max_shifts, options, weights=None, reporting=False):
+    """
+    Solves one component of a split allocate() call, in a worker process or in this one
+
+    Input:
+        part: The CoreProblem of the component
+        min_shifts, max_shifts: As for allocate()
+        options: The other keyword arguments of allocate() shared by every component
+        weights: The weights of allocate() for every officer, cut down to the component here
+        reporting: If True, return the report of the solve
+    Return:
+        (result, report) where result is the sparse allocation of the component in its own indices (or the partial
+        tuple of allocate()) and report is None unless reporting
+    """
+    report = {} if reporting else None
+    result = allocate(part.preferences, part.officers_per_org, min_shifts, max_shifts, report=report, output="sparse",
+                      precheck=False, days=part.days, shift_requirements=part.shift_requirements,
+                      officer_bounds=part.officer_bounds, weights=part.core_weights(weights),
+                      unavailable=part.unavailable, **options)
+    return result, report
+
+
+def merged_result(assignments, met, stopped, preferences, officers_per_org, min_shifts, output, days, shifts,
+                  shift_requirements, officer_bounds, store, key, partial, report=None, solver=None, weights=None,
+                  fairness=0, observer=None, reports=()):
+    """
+    Returns the result of allocate() for assignments put together from smaller solves (pruned or split)
+    The flows and stats of the report are the totals over the smaller solves, and observer is called once with the
+    summed SolverStats (empty if nothing was left to solve). The cost is computed again over the merged assignments, as
+    every smaller solve prices its shifts against its own highest weight and does not see the assignments of the others
+
+    Input:
+        assignments: The list of (officer, company, day, shift) assignments in full indices
+        met: True if every requirement is met
+        stopped: The reason should_stop stopped a solve, or None
+        store, key: The SolutionStore the result is added to (unless stopped) and its key, store may be None
+        reports: The reports of the smaller solves, given when report or observer is
+        The other inputs are as for allocate()
+
+    Time complexity:
+        Best case analysis: O(A + N + M) where A is the number of assignments, N is the number of officers and M is
+                            the number of companies
+        Worst case analysis: O(A + N * M) for the nested output
+    """
+    result = None
+    if met or partial:
+        result = build_output(assignments, len(preferences), len(officers_per_org), output, days, shifts)
+    if report is not None or observer is not None:
+        stats = SolverStats()
+        seeded_flow = 0
+        augmented_flow = 0
+        for part in reports:
+            stats.add(part["stats"])
+            seeded_flow += part["seeded_flow"]
+            if augmented_flow is not None:
+                augmented_flow = None if part["augmented_flow"] is None else augmented_flow + part["augmented_flow"]
+        if report is not None:
+            report["seeded_flow"] = seeded_flow
+            report["augmented_flow"] = augmented_flow
+            if solver == "mincost":
+                report["cost"] = allocation_cost(assignments, len(preferences), min_shifts, officer_bounds, weights,
+                                                 fairness)
+            report["stats"] = stats.as_dict()
+        if observer is not None:
+            observer(stats)
+    if store is not None and stopped is None:
+        store.put(key, (len(preferences), len(officers_per_org), days, shifts), assignments if met else None)
+    if partial:
+        missing = shortfall(assignments, len(preferences), officers_per_org, min_shifts, days, shifts,
+                            shift_requirements, officer_bounds)
+        missing["stopped"] = stopped
+        return result, missing
+    return result
+
+
+def allocation_cost(assignments, officer_count, min_shifts, officer_bounds=None, weights=None, fairness=0):
+    """
+    Returns the cost the "mincost" solver gives an allocation (see CompactFlowNetwork.set_costs): every shift costs the
+    highest weight minus the officer's weight for it, and an officer working u shifts above their minimum costs
+    fairness * u * (u - 1) / 2
+
+    Input:
+        assignments: The (officer, company, day, shift) assignments
+        officer_count: The number of officers
+        min_shifts, officer_bounds, weights, fairness: As for allocate()
+    Return:
+        The cost as an integer
+
+    Time complexity:
+        Best case analysis: O(A + N) where A is the number of assignments and N is the number of officers
+        Worst case analysis: O(A + N * S) where S is the number of shifts, for the highest weight
+    Space complexity:
+        Input space analysis: O(A + N * S)
+        Aux space analysis: O(N) for the shifts worked by every officer
+    """
+    top = max((max(officer) for officer in weights if officer), default=0) if weights is not None else 0
+    worked = [0] * officer_count
+    cost = 0
+    for officer, _, _, shift in assignments:
+        worked[officer] += 1
+        if weights is not None:
+            cost += top - weights[officer][shift]
+    bounds = officer_bounds or {}
+    for officer in range(officer_count):
+        above = worked[officer] - abs(bounds[officer][0] if officer in bounds else min_shifts)
+        if above > 1:
+            cost += fairness * above * (above - 1) // 2
+    return cost
+
+
+def shift_count(preferences, officers_per_org):
+    """
+    Returns the number of shifts per day of the inputs: the length of the preference and requirement subarrays, which
+    must all be the same (3 if there are no officers and no companies)
+    """
+    lengths = set(len(officer) for officer in preferences) | set(len(company) for company in officers_per_org)
+    if len(lengths) > 1:
+        raise ValueError("Every preference and requirement subarray needs the same number of shifts, got: " +
+                         ", ".join(str(length) for length in sorted(lengths)))
+    return lengths.pop() if lengths else 3
+
+
+def build_output(assignments, officer_count, company_count, output="nested", days=30, shifts=3):
+    """
+    Builds the result of allocate() from the assignments of a solved network
+
+    Input:
+        assignments: An iterable of (officer, company, day, shift) tuples
+        officer_count: The number of officers
+        company_count: The number of companies
+        output: The output format, one of OUTPUTS (see allocate())
+        days: The number of days in the roster
+        shifts: The number of shifts per day
+    Return:
+        The allocation in the requested output format
+
+    Time complexity:
+        Best case analysis: O(A) for the sparse format where A is the number of assignments
+        Worst case analysis: O(N * M) where N is the number of officers and M is the number of companies
+    Space complexity:
+        Input space analysis: O(1)
+        Aux space analysis: O(N * M) where N is the number of officers and M is the number of companies, O(A) for the
+                            sparse format
+    """
+    if output == "sparse":
+        return list(assignments)
+    if output == "dense":
+        if np is None:
+            raise ImportError("The dense output format requires NumPy")
+        dense = np.zeros((officer_count, company_count, days, shifts), dtype=np.uint8)
+        indices = np.array(list(assignments), dtype=np.intp).reshape(-1, 4)
+        dense[indices[:, 0], indices[:, 1], indices[:, 2], indices[:, 3]] = 1
+        return dense
+    output = [[]]*officer_count
+    for i in range(officer_count):
+        output[i] = [[]]*company_count
+        for j in range(company_count):
+            output[i][j] = [[]]*days
+            for k in range(days):
+                output[i][j][k] = [0]*shifts
+    for officer, company, day, shift in assignments:
+        output[officer][company][day][shift] = 1
     return output
 
 
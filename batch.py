@@ -0,0 +1,173 @@
+import argparse
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from allocation_system import allocate
+from solution_store import SolutionStore
+from topology_cache import TopologyCache
+
+# Keys of a request line that are passed to allocate(), every other key (such as "id") is copied to the result
+INPUT_KEYS = ("preferences", "officers_per_org", "min_shifts", "max_shifts")
+# Keys of a request line that are passed to allocate() as keyword arguments when present
+OPTIONAL_KEYS = ("days", "shift_requirements", "officer_bounds", "weights", "fairness", "partial", "unavailable")
+# The TopologyCache and SolutionStore of a worker process, set by init_worker
+worker_cache = None
+worker_store = None
+
+def init_worker(cache_entries, store_directory=None):
+    """
+    Sets up a worker process, giving it its own TopologyCache when cache_entries is above 0, and its own SolutionStore
+    over the shared store_directory when one is given
+    """
+    global worker_cache, worker_store
+    worker_cache = TopologyCache(cache_entries) if cache_entries > 0 else None
+    worker_store = SolutionStore(store_directory) if store_directory is not None else None
+
+
+def decode_overrides(request):
+    """
+    Converts the JSON form of the overrides of a request into the dictionaries of allocate(), in place
+        shift_requirements: A list of [company, day, shift, req]
+        officer_bounds: A list of [officer, min_shifts, max_shifts]
+    """
+    if "shift_requirements" in request:
+        request["shift_requirements"] = {(company, day, shift): req
+                                         for company, day, shift, req in request["shift_requirements"]}
+    if "officer_bounds" in request:
+        request["officer_bounds"] = {officer: (low, high) for officer, low, high in request["officer_bounds"]}
+
+
+def solve_line(index, line, options):
+    """
+    Solves one JSONL request line
+
+    Input:
+        index: The position of the line in the input, counting non-blank lines from 0
+        line: A JSON object with the inputs of allocate(), optionally the OPTIONAL_KEYS (see decode_overrides) and
+              optionally an "id"
+        options: Keyword arguments passed to allocate() for every line
+    Return:
+        A JSON encoded result with "index", "id" (if given) and either "allocation" or "error". Partial requests also
+        get the "shortfall" of the allocation
+    """
+    result = {"index": index}
+    try:
+        request = json.loads(line)
+        if "id" in request:
+            result["id"] = request["id"]
+        arguments = [request[key] for key in INPUT_KEYS]
+        decode_overrides(request)
+        keywords = dict(options)
+        for key in OPTIONAL_KEYS:
+            if key in request:
+                keywords[key] = request[key]
+        if worker_cache is not None:
+            keywords["cache"] = worker_cache
+        if worker_store is not None:
+            keywords["store"] = worker_store
+        if keywords.get("partial"):
+            result["allocation"], result["shortfall"] = allocate(*arguments, **keywords)
+        else:
+            result["allocation"] = allocate(*arguments, **keywords)
+    except Exception as error:
+        result["error"] = type(error).__name__ + ": " + str(error)
+    return json.dumps(result, separators=(",", ":"))
+
+
+def run_batch(lines, write, workers=None, ordered=True, max_pending=None, options=None, cache_entries=0,
+              store_directory=None):
+    """
+    Streams allocation requests through a process pool
+    At most max_pending requests are in flight at once, and no new line is read until one finishes, so the memory used
+    does not depend on the length of the input
+
+    Input:
+        lines: An iterable of JSONL request lines, read lazily
+        write: Called with every JSON encoded result
+        workers: The number of worker processes, defaults to the number of CPUs
+        ordered: If True, results are written in input order, otherwise as soon as they complete
+        max_pending: The most requests in flight at once, defaults to 4 per worker
+        options: Keyword arguments passed to allocate() for every line
+        cache_entries: If above 0, every worker keeps a TopologyCache of this many networks, so requests sharing the
+                       preferences of an earlier request on the same worker skip building the network
+        store_directory: If given, the directory of a SolutionStore shared by the workers, so repeated requests are
+                         answered from earlier results
+    Return:
+        The number of requests solved
+
+    Time complexity:
+        Best case analysis: O(R * T / W) where R is the number of requests, T the time per request and W the workers
+        Worst case analysis: O(R * T / W) where R is the number of requests, T the time per request and W the workers
+    Space complexity:
+        Input space analysis: O(1)
+        Aux space analysis: O(P) where P is max_pending
+    """
+    options = options or {}
+    if max_pending is None:
+        max_pending = 4 * (workers or os.cpu_count() or 1)
+    count = 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                             initargs=(cache_entries, store_directory)) as executor:
+        # In order mode the queue holds every unwritten result, in completion order only the ones still running
+        pending = deque()
+        running = set()
+        for line in lines:
+            if not line.strip():
+                continue
+            # Backpressure: wait for room before reading the next line
+            if ordered:
+                while pending and (len(pending) >= max_pending or pending[0].done()):
+                    write(pending.popleft().result())
+            else:
+                while len(running) >= max_pending:
+                    done, running = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        write(future.result())
+            future = executor.submit(solve_line, count, line, options)
+            if ordered:
+                pending.append(future)
+            else:
+                running.add(future)
+            count += 1
+
+        # Drain the requests still in flight
+        while pending:
+            write(pending.popleft().result())
+        while running:
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                write(future.result())
+    return count
+
+
+def main(argv=None):
+    """
+    Command line entry point, see python batch.py --help
+    """
+    parser = argparse.ArgumentParser(description="Solve a stream of JSONL allocation requests")
+    parser.add_argument("input", nargs="?", default="-", help="JSONL file of requests, - for stdin")
+    parser.add_argument("-o", "--output", default="-", help="JSONL file for the results, - for stdout")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="number of worker processes")
+    parser.add_argument("--unordered", action="store_true", help="write results in completion order")
+    parser.add_argument("--max-pending", type=int, default=None, help="most requests in flight at once")
+    parser.add_argument("--solver", default="fordfulkerson", help="max flow solver passed to allocate()")
+    parser.add_argument("--cache", type=int, default=0, help="networks cached per worker for reuse, 0 to disable")
+    parser.add_argument("--store", default=None, help="directory of a solution store shared by the workers")
+    args = parser.parse_args(argv)
+
+    source = sys.stdin if args.input == "-" else open(args.input)
+    sink = sys.stdout if args.output == "-" else open(args.output, "w")
+    try:
+        run_batch(source, lambda result: sink.write(result + "\n"), args.workers, not args.unordered,
+                  args.max_pending, {"solver": args.solver}, args.cache, args.store)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+import argparse
+import json
+import random
+import sys
+import time
+import tracemalloc
+from allocation_system import SOLVERS, build_output, shift_count
+from compact_network import CompactFlowNetwork
+from flow_network import FlowNetwork
+
+# Officer and company counts of the preset roster sizes
+SIZES = {
+    "toy": (10, 2),
+    "small": (100, 5),
+    "medium": (1000, 10),
+    "large": (10000, 20),
+}
+
+# Minimum and maximum shifts, and the share of the officers' capacity that is demanded, for each bound setting
+BOUNDS = {
+    "slack": (0, 20, 0.5),
+    "tight": (5, 10, 1.0),
+}
+
+def generate_roster(officers, companies, density=0.5, bounds="slack", feasible=True, seed=0, days=30, shifts=3):
+    """
+    Generates a random roster with the inputs of allocate()
+    Every officer is given a home shift among their preferences. A feasible roster only demands as many officers per
+    shift and day as the officers with that home shift can cover on a rotation within their maximum shifts, so an
+    allocation is known to exist. An infeasible roster then adds one officer of demand per day above the total capacity
+
+    Input:
+        officers: The number of officers
+        companies: The number of companies
+        density: The probability that an officer prefers each shift (every officer prefers at least one)
+        bounds: "slack" or "tight", see BOUNDS
+        feasible: Whether an allocation must exist
+        seed: The seed of the random generator
+        days: The number of days in the roster
+        shifts: The number of shifts per day
+    Return:
+        (preferences, officers_per_org, min_shifts, max_shifts)
+
+    Time complexity:
+        Best case analysis: O(N + M) where N is the number of officers and M is the number of companies
+        Worst case analysis: O(N + M) where N is the number of officers and M is the number of companies
+    """
+    rng = random.Random(seed)
+    min_shifts, max_shifts, share = BOUNDS[bounds]
+    # The bounds are set for a 30 day month, shorter rosters get their share of them
+    min_shifts = min_shifts * days // 30
+    max_shifts = max(1, max_shifts * days // 30)
+    preferences = []
+    home_count = [0] * shifts
+    for _ in range(officers):
+        officer = [1 if rng.random() < density else 0 for _ in range(shifts)]
+        if 1 not in officer:
+            officer[rng.randrange(shifts)] = 1
+        preferences.append(officer)
+        home_count[rng.choice([shift for shift in range(shifts) if officer[shift] == 1])] += 1
+
+    # Daily demand per shift that the home officers can cover on a rotation
+    demand = [int(home_count[shift] * max_shifts * share) // days for shift in range(shifts)]
+    if not feasible:
+        demand[rng.randrange(shifts)] += (officers * max_shifts) // days - sum(demand) + 1
+
+    officers_per_org = [[0] * shifts for _ in range(companies)]
+    for shift in range(shifts):
+        for _ in range(demand[shift]):
+            officers_per_org[rng.randrange(companies)][shift] += 1
+    return preferences, officers_per_org, min_shifts, max_shifts
+
+
+def measure(phase, timings, function, *args):
+    """
+    Runs one phase and records its wall clock time in seconds
+    """
+    start = time.perf_counter()
+    result = function(*args)
+    timings[phase] = time.perf_counter() - start
+    return result
+
+
+def run_case(roster, engine, solver, days=30):
+    """
+    Solves a roster phase by phase
+
+    Input:
+        roster: The (preferences, officers_per_org, min_shifts, max_shifts) of generate_roster()
+        engine: "object", "compact" or "aggregate" (the compact engine with aggregate=True)
+        solver: One of allocation_system.SOLVERS (only "fordfulkerson" for the object engine)
+        days: The number of days of the roster
+    Return:
+        (timings, flow, feasible) where timings maps each phase to seconds
+    """
+    timings = {}
+    shifts = shift_count(roster[0], roster[1])
+    if engine == "object":
+        fn = measure("build", timings, FlowNetwork, *roster, days, shifts)
+        measure("residual", timings, fn.residual_network)
+    else:
+        # The CSR arrays (the compact residual network) are built at the end of the constructor, which times them
+        fn = measure("build", timings, CompactFlowNetwork, *roster, False, engine == "aggregate", days, shifts)
+        timings["build"] -= fn.build_time
+        timings["residual"] = fn.build_time
+    flow = measure("augment", timings, getattr(fn, SOLVERS[solver]))
+    feasible = fn.requirements_met()
+    measure("output", timings, build_output, fn.assignments(), len(roster[0]), len(roster[1]), "nested", days,
+            shifts)
+    return timings, flow, feasible
+
+
+def memory_per_edge(officers=200, companies=5, seed=0):
+    """
+    Measures the memory each engine uses per flow network edge on a generated roster
+    For the object engine this covers the Node/Edge objects of the flow network and the RN_Node/RN_Edge objects of the
+    residual network, for the compact engine the CSR arrays
+
+    Return:
+        A dictionary mapping "object" and "compact" to the traced bytes per edge
+    """
+    roster = generate_roster(officers, companies, bounds="slack", seed=seed)
+    figures = {}
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    fn = FlowNetwork(*roster)
+    fn.residual_network()
+    edges = len(fn.ff_source.edges) + len(fn.source.edges)
+    for officer in fn.officer_nodes:
+        edges += len(officer.edges)
+    for allocation in fn.allocation_nodes:
+        for day in allocation:
+            edges += len(day.edges)
+    for company in fn.shift_nodes:
+        for day in company:
+            for shift in day:
+                edges += len(shift.edges)
+    figures["object"] = (tracemalloc.get_traced_memory()[0] - start) / edges
+    del fn
+
+    start = tracemalloc.get_traced_memory()[0]
+    fn = CompactFlowNetwork(*roster)
+    figures["compact"] = (tracemalloc.get_traced_memory()[0] - start) / fn.edge_count
+    tracemalloc.stop()
+    return figures
+
+
+def run(sizes, methods, densities, bounds, feasibility, repeat=1, memory=False, seed=0, days=30, shifts=3):
+    """
+    Runs every combination of the given settings
+
+    Return:
+        A list of result dictionaries, one per case and method, holding the best time of each phase over the repeats
+        and, with memory=True, the peak traced allocation in bytes (measured in an extra run, as tracing slows it down)
+    """
+    results = []
+    for size in sizes:
+        officers, companies = SIZES[size]
+        for density in densities:
+            for bound in bounds:
+                for feasible in feasibility:
+                    roster = generate_roster(officers, companies, density, bound, feasible, seed, days, shifts)
+                    for engine, solver in methods:
+                        best = None
+                        for _ in range(repeat):
+                            timings, flow, solved = run_case(roster, engine, solver, days)
+                            if best is None:
+                                best = timings
+                            else:
+                                for phase in best:
+                                    if timings[phase] is not None:
+                                        best[phase] = min(best[phase], timings[phase])
+                        result = {
+                            "size": size, "officers": officers, "companies": companies, "density": density,
+                            "bounds": bound, "feasible": feasible, "seed": seed, "days": days, "shifts": shifts,
+                            "engine": engine, "solver": solver,
+                            "phases": best, "total": sum(value for value in best.values() if value is not None),
+                            "flow": flow, "solved": solved,
+                        }
+                        if memory:
+                            tracemalloc.start()
+                            run_case(roster, engine, solver, days)
+                            result["peak_memory"] = tracemalloc.get_traced_memory()[1]
+                            tracemalloc.stop()
+                        results.append(result)
+                        print(format_result(result), file=sys.stderr)
+    return results
+
+
+def format_result(result):
+    """
+    Returns a one line summary of a result
+    """
+    phases = " ".join(phase + "=" + ("-" if value is None else "%.4f" % value) for phase, value in result["phases"].items())
+    line = "%s d=%s %s %s %s/%s %s total=%.4f" % (result["size"], result["density"], result["bounds"],
+                                                 "feasible" if result["feasible"] else "infeasible", result["engine"],
+                                                 result["solver"], phases, result["total"])
+    if "peak_memory" in result:
+        line += " peak=%.1fMiB" % (result["peak_memory"] / 2 ** 20)
+    return line
+
+
+def case_key(result):
+    """
+    Returns the settings that identify a case, used to match results of two runs
+    """
+    return (result["size"], result["density"], result["bounds"], result["feasible"], result["seed"],
+            result.get("days", 30), result.get("shifts", 3), result["engine"], result["solver"])
+
+
+def compare(old, new):
+    """
+    Prints the ratio new / old of every phase for the cases present in both result lists (below 1 is faster)
+    """
+    previous = {case_key(result): result for result in old}
+    for result in new:
+        before = previous.get(case_key(result))
+        if before is None:
+            continue
+        ratios = []
+        for phase, value in list(result["phases"].items()) + [("total", result["total"])]:
+            old_value = before["phases"].get(phase) if phase != "total" else before["total"]
+            if value is not None and old_value:
+                ratios.append("%s=%.2fx" % (phase, value / old_value))
+        if "peak_memory" in result and before.get("peak_memory"):
+            ratios.append("peak=%.2fx" % (result["peak_memory"] / before["peak_memory"]))
+        print("%s d=%s %s %s %s/%s %s" % (result["size"], result["density"], result["bounds"],
+                                         "feasible" if result["feasible"] else "infeasible", result["engine"],
+                                         result["solver"], " ".join(ratios)))
+
+
+def main(argv=None):
+    """
+    Command line entry point, see python benchmark.py --help
+    Example:
+        python benchmark.py --sizes toy,small --methods object:fordfulkerson,compact:dinic -o before.json
+        python benchmark.py --sizes toy,small --methods object:fordfulkerson,compact:dinic -o after.json
+        python benchmark.py --compare before.json after.json
+    """
+    parser = argparse.ArgumentParser(description="Benchmark allocate() phase by phase on generated rosters")
+    parser.add_argument("--sizes", default="toy,small", help="comma separated sizes from: " + ",".join(SIZES))
+    parser.add_argument("--methods", default="object:fordfulkerson,compact:fordfulkerson,compact:dinic,compact:pushrelabel",
+                        help="comma separated engine:solver pairs, engine is object, compact or aggregate")
+    parser.add_argument("--densities", default="0.5", help="comma separated preference densities")
+    parser.add_argument("--bounds", default="slack,tight", help="comma separated bound settings from: " + ",".join(BOUNDS))
+    parser.add_argument("--feasibility", default="feasible", help="comma separated from: feasible,infeasible")
+    parser.add_argument("--repeat", type=int, default=1, help="runs per case, the best time of each phase is kept")
+    parser.add_argument("--memory", action="store_true", help="also measure peak memory with tracemalloc")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the roster generator")
+    parser.add_argument("--days", type=int, default=30, help="number of days of the generated rosters")
+    parser.add_argument("--shifts", type=int, default=3, help="number of shifts per day of the generated rosters")
+    parser.add_argument("-o", "--output", default="-", help="JSON file for the results, - for stdout")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="compare two result files instead")
+    parser.add_argument("--memory-per-edge", action="store_true", help="only measure the bytes per edge of each engine")
+    args = parser.parse_args(argv)
+
+    if args.memory_per_edge:
+        for engine, value in memory_per_edge().items():
+            print("%s: %.1f bytes per edge" % (engine, value))
+        return
+
+    if args.compare:
+        with open(args.compare[0]) as old, open(args.compare[1]) as new:
+            compare(json.load(old), json.load(new))
+        return
+
+    methods = [tuple(method.split(":")) for method in args.methods.split(",")]
+    results = run(args.sizes.split(","), methods, [float(density) for density in args.densities.split(",")],
+                  args.bounds.split(","), [value == "feasible" for value in args.feasibility.split(",")], args.repeat,
+                  args.memory, args.seed, args.days, args.shifts)
+    if args.output == "-":
+        json.dump(results, sys.stdout, indent=1)
+        print()
+    else:
+        with open(args.output, "w") as output:
+            json.dump(results, output, indent=1)
+
+
+if __name__ == "__main__":
+    main()
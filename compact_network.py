@@ -0,0 +1,1399 @@
+import time
+from array import array
+from collections import deque
+from heapq import heappop, heappush
+from demand import daily_demand, requirement, total_minimum, total_requirement
+from interrupt import SolveInterrupted
+
+class CompactGraph:
+    """
+    Array backed flow graph
+    Nodes are integers in the range [0, size). Every edge added to the graph becomes a forward/backward pair of residual
+    arcs stored in CSR (compressed sparse row) form. Each arc has its own capacity and flow entry, and push() keeps the
+    flows of a pair opposite:
+        offsets: arcs leaving node u are stored at positions offsets[u] to offsets[u + 1] - 1
+        head: the node the arc points to
+        cap: the capacity of the arc (0 for backward arcs)
+        flow: the flow on the arc, where flow[rev[a]] == -flow[a]
+        rev: the position of the paired arc
+    The residual capacity of an arc is cap[a] - flow[a], which covers both forward and backward arcs.
+    Graphs solved with MinCostFlow also hold cost and slope arrays (see set_cost) and the node potentials of the last
+    solve, all None until first used.
+    Setting the stats attribute to a SolverStats records the searches and augmenting paths of the solvers.
+    Setting the should_stop attribute to a function makes the solvers call it between augmentations and raise
+    SolveInterrupted once it returns True, see check_stop.
+    """
+    def __init__(self, size):
+        self.size = size
+        self.pending = array('l')
+        self.edge_count = 0
+        self.stats = None
+        self.should_stop = None
+        self.build_time = 0
+        self.cost = None
+        self.slope = None
+        self.potential = None
+
+    def add_edge(self, start, end, capacity):
+        """
+        Adds an edge to the graph. Must be called before build()
+
+        Input:
+            start: The start node of the edge
+            end: The end node of the edge
+            capacity: The capacity of the edge
+        Return:
+            The index of the edge. Once the graph is built its forward arc is self.forward[edge], and the index can be
+            passed to set_capacity and set_cost
+
+        Time complexity:
+            Best case analysis: O(1)
+            Worst case analysis: O(1)
+        """
+        self.pending.extend((start, end, capacity))
+        self.edge_count += 1
+        return self.edge_count - 1
+
+    def build(self):
+        """
+        Converts the added edges into CSR arrays. Arcs leaving a node keep the order in which they were added to the
+        graph, which matches the order the residual network adds edges to its RN_Nodes
+
+        Time complexity:
+            Best case analysis: O(V + E) where V is the number of vertices and E is the number of edges in the graph
+            Worst case analysis: O(V + E) where V is the number of vertices and E is the number of edges in the graph
+        Space complexity:
+            Input space analysis: O(1)
+            Aux space analysis: O(V + E) where V is the number of vertices and E is the number of edges in the graph
+        """
+        start_time = time.perf_counter()
+        pending = self.pending
+        arcs = 2 * self.edge_count
+
+        # Count the arcs leaving each node, then turn the counts into offsets
+        offsets = array('l', bytes(8 * (self.size + 1)))
+        for i in range(0, len(pending), 3):
+            offsets[pending[i] + 1] += 1
+            offsets[pending[i + 1] + 1] += 1
+        for u in range(self.size):
+            offsets[u + 1] += offsets[u]
+
+        # Place the arcs in the order they were created (stable counting sort)
+        self.head = array('l', bytes(8 * arcs))
+        self.cap = array('l', bytes(8 * arcs))
+        self.flow = array('l', bytes(8 * arcs))
+        self.rev = array('l', bytes(8 * arcs))
+        self.forward = array('l', bytes(8 * self.edge_count))
+        fill = array('l', offsets)
+        for k in range(self.edge_count):
+            start, end, capacity = pending[3 * k], pending[3 * k + 1], pending[3 * k + 2]
+            forward_arc = fill[start]
+            fill[start] += 1
+            backward_arc = fill[end]
+            fill[end] += 1
+            self.head[forward_arc] = end
+            self.cap[forward_arc] = capacity
+            self.rev[forward_arc] = backward_arc
+            self.head[backward_arc] = start
+            self.rev[backward_arc] = forward_arc
+            self.forward[k] = forward_arc
+        self.offsets = offsets
+        self.pending = None
+
+        # Search buffers shared by every BFS. A node counts as visited only if its stamp equals the current epoch,
+        # so starting a new search costs O(1) instead of clearing the visited array
+        self.epoch = 0
+        self.visited = array('l', bytes(8 * self.size))
+        self.edge_taken = array('l', bytes(8 * self.size))
+        self.queue = array('l', bytes(8 * self.size))
+        self.build_time = time.perf_counter() - start_time
+
+    def push(self, arc, value):
+        """
+        Pushes the given amount of flow along an arc, updating its paired arc
+        """
+        self.flow[arc] += value
+        self.flow[self.rev[arc]] -= value
+
+    def record_search(self, served, found):
+        """
+        Records a finished BFS in the stats, counting the edges of the first served nodes of the queue
+        (the last served node is the sink when found is True, and its edges were not scanned)
+        """
+        offsets, queue = self.offsets, self.queue
+        edges = 0
+        for i in range(served - 1 if found else served):
+            edges += offsets[queue[i] + 1] - offsets[queue[i]]
+        self.stats.record_search(served, edges)
+
+    def set_capacity(self, edge, capacity, source, sink):
+        """
+        Changes the capacity of an edge after flow has been found
+        If the edge carries more flow than the new capacity, the excess is cancelled one unit at a time along a
+        source to sink path through the edge, so the flow stays valid. Running a solver again afterwards only has to
+        augment the flow that was lost
+
+        Precondition: the graph has no flow carrying cycles
+        Input:
+            edge: The index returned by add_edge()
+            capacity: The new capacity of the edge
+            source: The source node
+            sink: The sink node
+        Return:
+            The amount of flow cancelled
+
+        Time complexity:
+            Best case analysis: O(1) when the flow fits in the new capacity
+            Worst case analysis: O(X * (V + E)) where X is the flow cancelled
+        """
+        arc = self.forward[edge]
+        self.cap[arc] = capacity
+        excess = self.flow[arc] - capacity
+        for _ in range(excess):
+            self.cancel_unit(arc, source, sink)
+        return max(excess, 0)
+
+    def cancel_unit(self, arc, source, sink):
+        """
+        Removes one unit of flow from a flow carrying arc, together with the rest of a source to sink path through it
+
+        Time complexity:
+            Best case analysis: O(1) when the arc joins the source to the sink
+            Worst case analysis: O(V + E) where V is the number of vertices and E is the number of edges in the graph
+        """
+        offsets, head, flow, rev = self.offsets, self.head, self.flow, self.rev
+        self.push(arc, -1)
+
+        # Walk back to the source along arcs that carry flow into the node (their paired arcs have negative flow)
+        current_node = head[rev[arc]]
+        while current_node != source:
+            for incoming in range(offsets[current_node], offsets[current_node + 1]):
+                if flow[incoming] < 0:
+                    break
+            self.push(incoming, 1)
+            current_node = head[incoming]
+
+        # Walk forward to the sink along arcs that carry flow out of the node
+        current_node = head[arc]
+        while current_node != sink:
+            for outgoing in range(offsets[current_node], offsets[current_node + 1]):
+                if flow[outgoing] > 0:
+                    break
+            self.push(outgoing, -1)
+            current_node = head[outgoing]
+
+    def check_stop(self):
+        """
+        Raises SolveInterrupted if the should_stop function returns True, with its reason attribute if it has one
+        """
+        if self.should_stop is not None and self.should_stop():
+            raise SolveInterrupted(getattr(self.should_stop, "reason", None) or "cancelled")
+
+    def FordFulkerson(self, source, sink):
+        """
+        Runs the Ford Fulkerson algorithm on the graph, using BFS to find the augmenting paths
+
+        Precondition: build() has been called
+        Postcondition: Finds the maximum flow from the source node to the sink node in the graph
+
+        Input:
+            source: The source node
+            sink: The sink node
+        Return:
+            The amount of flow pushed from the source to the sink
+
+        Time complexity:
+            Best case analysis: O(F * (V + E)) where F is the maximum flow of the network, V is the number of vertices and E is the number of edges in the network
+            Worst case analysis: O(F * (V + E)) where F is the maximum flow of the network, V is the number of vertices and E is the number of edges in the network
+        Space complexity:
+            Input space analysis: O(1)
+            Aux space analysis: O(V) where V is the number of vertices in the network
+        """
+        total = 0
+        head, cap, flow, rev = self.head, self.cap, self.flow, self.rev
+        while True:
+            self.check_stop()
+            edge_taken = self.PathAugmentation(source, sink)
+            if edge_taken is None:
+                break
+
+            # Find the minimum residual capacity along the path, then push it along every arc
+            min_flow = float('inf')
+            length = 0
+            current_node = sink
+            while current_node != source:
+                arc = edge_taken[current_node]
+                min_flow = min(min_flow, cap[arc] - flow[arc])
+                length += 1
+                current_node = head[rev[arc]]
+            if self.stats is not None:
+                self.stats.record_path(length)
+            current_node = sink
+            while current_node != source:
+                arc = edge_taken[current_node]
+                flow[arc] += min_flow
+                flow[rev[arc]] -= min_flow
+                current_node = head[rev[arc]]
+            total += min_flow
+        return total
+
+    def PathAugmentation(self, source, sink):
+        """
+        Finds an augmenting path in the residual graph using BFS, reusing the preallocated search buffers
+
+        Input:
+            source: The start node of the path
+            sink: The end node of the path
+        Return:
+            An array holding the arc taken to reach each node if a path is found, None otherwise
+
+        Time complexity:
+            Best case analysis: O(V + E) where V is the number of vertices and E is the number of edges in the network
+            Worst case analysis: O(V + E) where V is the number of vertices and E is the number of edges in the network
+        Space complexity:
+            Input space analysis: O(1)
+            Aux space analysis: O(1)
+        """
+        offsets, head, cap, flow = self.offsets, self.head, self.cap, self.flow
+        visited, edge_taken, queue = self.visited, self.edge_taken, self.queue
+        self.epoch += 1
+        epoch = self.epoch
+        visited[source] = epoch
+        queue[0] = source
+        front = 0
+        rear = 1
+        while front < rear:
+            current_node = queue[front]
+            front += 1
+            if current_node == sink:
+                if self.stats is not None:
+                    self.record_search(front, True)
+                return edge_taken
+            for arc in range(offsets[current_node], offsets[current_node + 1]):
+                end = head[arc]
+                if visited[end] != epoch and cap[arc] - flow[arc] > 0:
+                    visited[end] = epoch
+                    edge_taken[end] = arc
+                    queue[rear] = end
+                    rear += 1
+        if self.stats is not None:
+            self.record_search(front, False)
+        return None
+
+    def Dinic(self, source, sink):
+        """
+        Runs Dinic's algorithm on the graph
+        Each phase builds a level graph with BFS and then saturates it with a blocking flow, so every augmenting path
+        found in a phase has the same (shortest) length
+
+        Precondition: build() has been called
+        Postcondition: Finds the maximum flow from the source node to the sink node in the graph
+
+        Input:
+            source: The source node
+            sink: The sink node
+        Return:
+            The amount of flow pushed from the source to the sink
+
+        Time complexity:
+            Best case analysis: O(E * sqrt(V)) on unit capacity networks such as the allocation layers
+            Worst case analysis: O(V^2 * E) where V is the number of vertices and E is the number of edges in the network
+        Space complexity:
+            Input space analysis: O(1)
+            Aux space analysis: O(V) where V is the number of vertices in the network
+        """
+        total = 0
+        while True:
+            self.check_stop()
+            level = self.level_graph(source, sink)
+            if level is None:
+                break
+            total += self.blocking_flow(source, sink, level)
+        return total
+
+    def level_graph(self, source, sink):
+        """
+        Labels every node with its BFS distance from the source in the residual graph
+
+        Return:
+            An array of levels (-1 for unreachable nodes) if the sink is reachable, None otherwise
+
+        Time complexity:
+            Best case analysis: O(V + E) where V is the number of vertices and E is the number of edges in the network
+            Worst case analysis: O(V + E) where V is the number of vertices and E is the number of edges in the network
+        """
+        offsets, head, cap, flow = self.offsets, self.head, self.cap, self.flow
+        queue = self.queue
+        level = array('l', [-1]) * self.size
+        level[source] = 0
+        queue[0] = source
+        front = 0
+        rear = 1
+        while front < rear:
+            current_node = queue[front]
+            front += 1
+            next_level = level[current_node] + 1
+            for arc in range(offsets[current_node], offsets[current_node + 1]):
+                end = head[arc]
+                if level[end] < 0 and cap[arc] - flow[arc] > 0:
+                    level[end] = next_level
+                    queue[rear] = end
+                    rear += 1
+        if self.stats is not None:
+            self.record_search(front, False)
+        if level[sink] < 0:
+            return None
+        return level
+
+    def blocking_flow(self, source, sink, level):
+        """
+        Saturates the level graph using an iterative DFS that only follows arcs from level l to level l + 1
+        Each node keeps a pointer to the next arc to try, so an arc that is saturated or leads to a dead end is never
+        scanned twice in the same phase
+
+        Return:
+            The amount of flow pushed from the source to the sink
+
+        Time complexity:
+            Best case analysis: O(V + E) when every path is unit capacity
+            Worst case analysis: O(V * E) where V is the number of vertices and E is the number of edges in the network
+        """
+        offsets, head, cap, flow, rev = self.offsets, self.head, self.cap, self.flow, self.rev
+        current = array('l', offsets)
+        total = 0
+        path = []
+        current_node = source
+        while True:
+            if current_node == sink:
+                # Push the bottleneck along the path, then retreat to the tail of the first saturated arc
+                min_flow = min(cap[arc] - flow[arc] for arc in path)
+                for arc in path:
+                    flow[arc] += min_flow
+                    flow[rev[arc]] -= min_flow
+                total += min_flow
+                if self.stats is not None:
+                    self.stats.record_path(len(path))
+                if self.should_stop is not None:
+                    self.check_stop()
+                for i in range(len(path)):
+                    if cap[path[i]] - flow[path[i]] == 0:
+                        break
+                current_node = head[rev[path[i]]]
+                del path[i:]
+                continue
+
+            # Advance along the next admissible arc
+            arc = current[current_node]
+            end = offsets[current_node + 1]
+            next_level = level[current_node] + 1
+            while arc < end and (cap[arc] - flow[arc] <= 0 or level[head[arc]] != next_level):
+                arc += 1
+            current[current_node] = arc
+            if arc < end:
+                path.append(arc)
+                current_node = head[arc]
+                continue
+
+            # Dead end, retreat and skip the arc that led here
+            if not path:
+                break
+            arc = path.pop()
+            current_node = head[rev[arc]]
+            current[current_node] += 1
+        return total
+
+    def PushRelabel(self, source, sink):
+        """
+        Runs the highest label push-relabel algorithm on the graph
+        Heights start from an exact BFS distance to the sink and the gap heuristic lifts nodes that can no longer reach
+        the sink, so their excess is returned to the source and the result is a valid flow. A solve stopped by
+        should_stop also returns the excess still held by the nodes to the source (see return_excess) before raising
+
+        Precondition: build() has been called
+        Postcondition: Finds the maximum flow from the source node to the sink node in the graph
+
+        Input:
+            source: The source node
+            sink: The sink node
+        Return:
+            The amount of flow pushed from the source to the sink
+
+        Time complexity:
+            Best case analysis: O(V + E) when every preflow push reaches the sink directly
+            Worst case analysis: O(V^2 * sqrt(E)) where V is the number of vertices and E is the number of edges in the network
+        Space complexity:
+            Input space analysis: O(1)
+            Aux space analysis: O(V) where V is the number of vertices in the network
+        """
+        offsets, head, cap, flow, rev = self.offsets, self.head, self.cap, self.flow, self.rev
+        n = self.size
+        height = self.sink_distances(sink)
+        height[source] = n
+        excess = array('l', bytes(8 * n))
+        current = array('l', offsets)
+        count = array('l', bytes(8 * (2 * n + 1)))
+        for u in range(n):
+            count[height[u]] += 1
+        buckets = [[] for _ in range(2 * n + 1)]
+        highest = 0
+        pushes = 0
+        relabels = 0
+
+        # Saturate every arc leaving the source
+        for arc in range(offsets[source], offsets[source + 1]):
+            residual = cap[arc] - flow[arc]
+            if residual > 0:
+                end = head[arc]
+                flow[arc] += residual
+                flow[rev[arc]] -= residual
+                if excess[end] == 0 and end != sink:
+                    buckets[height[end]].append(end)
+                    highest = max(highest, height[end])
+                excess[end] += residual
+
+        while highest >= 0:
+            if not buckets[highest]:
+                highest -= 1
+                continue
+            if self.should_stop is not None:
+                try:
+                    self.check_stop()
+                except SolveInterrupted:
+                    self.return_excess(excess, source, sink)
+                    raise
+            current_node = buckets[highest].pop()
+
+            # Discharge the node: push along admissible arcs, relabel when none are left
+            while excess[current_node] > 0:
+                arc = current[current_node]
+                end_arc = offsets[current_node + 1]
+                target = height[current_node] - 1
+                while arc < end_arc and (cap[arc] - flow[arc] <= 0 or height[head[arc]] != target):
+                    arc += 1
+                current[current_node] = arc
+                if arc < end_arc:
+                    end = head[arc]
+                    value = min(excess[current_node], cap[arc] - flow[arc])
+                    flow[arc] += value
+                    flow[rev[arc]] -= value
+                    excess[current_node] -= value
+                    pushes += 1
+                    if excess[end] == 0 and end != sink and end != source:
+                        buckets[height[end]].append(end)
+                        highest = max(highest, height[end])
+                    excess[end] += value
+                    continue
+
+                # Relabel to one more than the lowest neighbour reachable in the residual graph
+                relabels += 1
+                old_height = height[current_node]
+                new_height = 2 * n
+                for arc in range(offsets[current_node], end_arc):
+                    if cap[arc] - flow[arc] > 0:
+                        new_height = min(new_height, height[head[arc]] + 1)
+                count[old_height] -= 1
+                if count[old_height] == 0 and old_height < n:
+                    # Gap heuristic, every node above the gap can no longer reach the sink
+                    for u in range(n):
+                        if old_height < height[u] < n:
+                            count[height[u]] -= 1
+                            height[u] = n + 1
+                            count[n + 1] += 1
+                    for h in range(old_height + 1, n):
+                        for u in buckets[h]:
+                            buckets[n + 1].append(u)
+                        buckets[h] = []
+                    new_height = max(new_height, n + 1)
+                height[current_node] = new_height
+                count[new_height] += 1
+                current[current_node] = offsets[current_node]
+
+        if self.stats is not None:
+            self.stats.pushes += pushes
+            self.stats.relabels += relabels
+        return excess[sink]
+
+    def return_excess(self, excess, source, sink):
+        """
+        Turns the preflow of a stopped PushRelabel into a flow, sending the excess held by every node back along the
+        arcs that brought it in until it reaches the source
+        Every push lowers the flow on an arc, so the walk ends even when the flow has cycles
+
+        Input:
+            excess: The excess of every node
+            source: The source node
+            sink: The sink node
+        Return:
+            The amount of flow returned to the source
+
+        Time complexity:
+            Best case analysis: O(V) where V is the number of vertices in the graph, when no node holds excess
+            Worst case analysis: O(V + X * E) where X is the excess returned and E is the number of edges in the graph
+        """
+        offsets, head, flow, rev = self.offsets, self.head, self.flow, self.rev
+        stack = [u for u in range(self.size) if excess[u] > 0 and u != source and u != sink]
+        returned = 0
+        while stack:
+            current_node = stack.pop()
+            for arc in range(offsets[current_node], offsets[current_node + 1]):
+                if excess[current_node] == 0:
+                    break
+                # A backward arc with negative flow undoes flow that came into the node
+                if flow[arc] < 0:
+                    value = min(excess[current_node], -flow[arc])
+                    flow[arc] += value
+                    flow[rev[arc]] -= value
+                    excess[current_node] -= value
+                    end = head[arc]
+                    if end == source:
+                        returned += value
+                    else:
+                        if excess[end] == 0:
+                            stack.append(end)
+                        excess[end] += value
+        return returned
+
+    def sink_distances(self, sink):
+        """
+        Labels every node with its BFS distance to the sink in the residual graph (V for nodes that cannot reach it)
+
+        Time complexity:
+            Best case analysis: O(V + E) where V is the number of vertices and E is the number of edges in the network
+            Worst case analysis: O(V + E) where V is the number of vertices and E is the number of edges in the network
+        """
+        offsets, head, cap, flow, rev = self.offsets, self.head, self.cap, self.flow, self.rev
+        queue = self.queue
+        distance = array('l', [self.size]) * self.size
+        distance[sink] = 0
+        queue[0] = sink
+        front = 0
+        rear = 1
+        while front < rear:
+            current_node = queue[front]
+            front += 1
+            for arc in range(offsets[current_node], offsets[current_node + 1]):
+                end = head[arc]
+                backward = rev[arc]
+                if distance[end] == self.size and end != sink and cap[backward] - flow[backward] > 0:
+                    distance[end] = distance[current_node] + 1
+                    queue[rear] = end
+                    rear += 1
+        if self.stats is not None:
+            self.record_search(front, False)
+        return distance
+
+    def set_cost(self, edge, cost, slope=0):
+        """
+        Sets the cost of an edge for MinCostFlow. The cost arrays are only allocated once the first cost is set
+        The k-th unit of flow on the edge (counting from 0) costs cost + slope * k, so a positive slope makes the edge
+        convex. Each arc stores the cost of its next unit as cost[a] + slope[a] * flow[a], which for the backward arc is
+        minus the cost of the last unit pushed
+
+        Precondition: build() has been called
+        Input:
+            edge: The index returned by add_edge()
+            cost: The cost of the first unit of flow
+            slope: The increase in cost of every further unit (0 or more)
+        """
+        if self.cost is None:
+            self.cost = array('l', bytes(8 * 2 * self.edge_count))
+            self.slope = array('l', bytes(8 * 2 * self.edge_count))
+        arc = self.forward[edge]
+        self.cost[arc] = cost
+        self.cost[self.rev[arc]] = slope - cost
+        self.slope[arc] = slope
+        self.slope[self.rev[arc]] = slope
+
+    def flow_cost(self):
+        """
+        Returns the total cost of the current flow (0 if no cost was set)
+
+        Time complexity:
+            Best case analysis: O(E) where E is the number of edges in the graph
+            Worst case analysis: O(E) where E is the number of edges in the graph
+        """
+        if self.cost is None:
+            return 0
+        total = 0
+        for arc in self.forward:
+            units = self.flow[arc]
+            total += self.cost[arc] * units + self.slope[arc] * units * (units - 1) // 2
+        return total
+
+    def MinCostFlow(self, source, sink):
+        """
+        Finds the maximum flow of least cost, see set_cost
+        The current flow is kept as a warm start, made the cheapest flow of its value under node potentials for which
+        every residual arc has a non-negative reduced cost:
+            first call: the potentials are the shortest distances from the source at zero flow, and the seeded flow is
+                        trimmed to the arcs that are tight under them, see trim_flow
+            later calls: the potentials of the previous call are kept, and the negative cycles a change created are
+                         cancelled, see cancel_negative_cycles
+        The remaining flow is then added by successive shortest paths: each phase runs Dijkstra on the reduced costs,
+        moves the potentials by the distances, and saturates the arcs of zero reduced cost with a blocking flow, so every
+        path of the same cost is pushed in one phase
+
+        Precondition: build() has been called, no cost is negative and the flow has no flow carrying cycles
+        Postcondition: Finds a maximum flow from the source to the sink of least cost
+        Input:
+            source: The source node
+            sink: The sink node
+        Return:
+            The amount of flow pushed from the source to the sink
+
+        Time complexity:
+            Best case analysis: O(E log V) when the warm start is already a maximum flow of least cost
+            Worst case analysis: O(C * V * E + P * (E log V + V * E)) where C is the number of negative cycles
+                                 cancelled and P is the number of distinct shortest path costs
+        Space complexity:
+            Input space analysis: O(1)
+            Aux space analysis: O(V) where V is the number of vertices in the network
+        """
+        if self.cost is None:
+            self.cost = array('l', bytes(8 * 2 * self.edge_count))
+            self.slope = array('l', bytes(8 * 2 * self.edge_count))
+        if self.potential is None:
+            self.check_stop()
+            self.potential = self.initial_potentials(source)
+            self.trim_flow(source, sink)
+        else:
+            self.cancel_negative_cycles()
+        total = 0
+        while True:
+            self.check_stop()
+            if not self.update_potentials(source, sink):
+                break
+            while True:
+                level = self.admissible_levels(source, sink)
+                if level is None:
+                    break
+                total += self.admissible_flow(source, sink, level)
+        return total
+
+    def initial_potentials(self, source):
+        """
+        Returns the shortest distance from the source to every node over the edges of the graph, using the cost of
+        their first unit of flow and ignoring the current flow. Nodes the source cannot reach get the largest distance
+
+        Time complexity:
+            Best case analysis: O(E log V) where V is the number of vertices and E is the number of edges in the graph
+            Worst case analysis: O(E log V) where V is the number of vertices and E is the number of edges in the graph
+        """
+        offsets, head, cap, cost = self.offsets, self.head, self.cap, self.cost
+        unreached = 1 << 62
+        distance = array('q', [unreached]) * self.size
+        distance[source] = 0
+        heap = [(0, source)]
+        while heap:
+            label, current_node = heappop(heap)
+            if label > distance[current_node]:
+                continue
+            for arc in range(offsets[current_node], offsets[current_node + 1]):
+                # Backward arcs have no capacity of their own
+                if cap[arc] > 0 and label + cost[arc] < distance[head[arc]]:
+                    distance[head[arc]] = label + cost[arc]
+                    heappush(heap, (label + cost[arc], head[arc]))
+        farthest = max((value for value in distance if value != unreached), default=0)
+        return array('l', (farthest if value == unreached else value for value in distance))
+
+    def trim_flow(self, source, sink):
+        """
+        Cancels the units of flow whose last unit is dearer than the potentials allow, one source to sink path at a time
+        The potentials of initial_potentials never leave a forward arc with a negative reduced cost, so once every arc
+        carrying flow is tight the flow is the cheapest of its value
+
+        Return:
+            The amount of flow cancelled
+
+        Time complexity:
+            Best case analysis: O(E) where E is the number of edges in the graph, when the flow is already tight
+            Worst case analysis: O(E + X * (V + E)) where X is the flow cancelled
+        """
+        head, flow, rev = self.head, self.flow, self.rev
+        cost, slope, potential = self.cost, self.slope, self.potential
+        cancelled = 0
+        for arc in self.forward:
+            start, end = head[rev[arc]], head[arc]
+            while flow[arc] > 0 and cost[arc] + slope[arc] * (flow[arc] - 1) + potential[start] - potential[end] > 0:
+                self.cancel_unit(arc, source, sink)
+                cancelled += 1
+        return cancelled
+
+    def cancel_negative_cycles(self):
+        """
+        Cancels every negative cost cycle of the residual graph
+        Runs a queue based Bellman-Ford from a virtual node joined to every node by a zero cost arc, keeping the labels
+        in self.potential. Every V relaxations the tree of last relaxed arcs is checked for a cycle, which is then a
+        negative cycle; flow is pushed around it and the search carries on from the same labels. When the queue empties
+        the labels are feasible potentials
+
+        Return:
+            The number of cycles cancelled
+
+        Time complexity:
+            Best case analysis: O(V + E) when there is no negative cycle and the labels are already feasible
+            Worst case analysis: O(C * V * E) where C is the number of negative cycles cancelled
+        """
+        offsets, head, cap, flow, rev = self.offsets, self.head, self.cap, self.flow, self.rev
+        cost, slope, potential = self.cost, self.slope, self.potential
+        n = self.size
+        parent = array('l', [-1]) * n
+        queued = bytearray(b'\x01') * n
+        queue = deque(range(n))
+        relaxations = 0
+        cancelled = 0
+        while queue:
+            current_node = queue.popleft()
+            queued[current_node] = 0
+            label = potential[current_node]
+            for arc in range(offsets[current_node], offsets[current_node + 1]):
+                if cap[arc] - flow[arc] > 0:
+                    end = head[arc]
+                    distance = label + cost[arc] + slope[arc] * flow[arc]
+                    if distance < potential[end]:
+                        potential[end] = distance
+                        parent[end] = arc
+                        if not queued[end]:
+                            queued[end] = 1
+                            queue.append(end)
+                        relaxations += 1
+            if relaxations < n:
+                continue
+            relaxations = 0
+            cycle = self.parent_cycle(parent)
+            if cycle is None:
+                continue
+            for arc in cycle:
+                parent[head[arc]] = -1
+                for node in (head[arc], head[rev[arc]]):
+                    if not queued[node]:
+                        queued[node] = 1
+                        queue.append(node)
+            # The tree may hold arcs that changed since they were relaxed, only cancel cycles that are still negative
+            if sum(cost[arc] + slope[arc] * flow[arc] for arc in cycle) >= 0:
+                continue
+            value = min(cap[arc] - flow[arc] if slope[arc] == 0 else 1 for arc in cycle)
+            if value <= 0:
+                continue
+            for arc in cycle:
+                flow[arc] += value
+                flow[rev[arc]] -= value
+            cancelled += 1
+            if self.should_stop is not None:
+                try:
+                    self.check_stop()
+                except SolveInterrupted:
+                    # The labels are not feasible potentials yet, the next solve starts over from initial_potentials
+                    self.potential = None
+                    raise
+        return cancelled
+
+    def parent_cycle(self, parent):
+        """
+        Returns the arcs of a cycle in the tree of parent arcs, or None if it has no cycle
+
+        Time complexity:
+            Best case analysis: O(V) where V is the number of vertices in the graph
+            Worst case analysis: O(V) where V is the number of vertices in the graph
+        """
+        head, rev = self.head, self.rev
+        # Each walk stamps the nodes it passes with its own start, so meeting a stamp of the same walk closes a cycle
+        stamp = array('l', [-1]) * self.size
+        for start in range(self.size):
+            current_node = start
+            while current_node >= 0 and stamp[current_node] < 0:
+                stamp[current_node] = start
+                current_node = head[rev[parent[current_node]]] if parent[current_node] >= 0 else -1
+            if current_node >= 0 and stamp[current_node] == start:
+                cycle = []
+                node = current_node
+                while True:
+                    arc = parent[node]
+                    cycle.append(arc)
+                    node = head[rev[arc]]
+                    if node == current_node:
+                        return cycle
+        return None
+
+    def update_potentials(self, source, sink):
+        """
+        Runs Dijkstra from the source on the reduced costs of the residual graph and adds the distances to the
+        potentials, capped at the distance of the sink, so every shortest path to the sink has zero reduced cost
+
+        Return:
+            True if the sink is reachable, False otherwise
+
+        Time complexity:
+            Best case analysis: O(V + E) when the sink is the first node settled after its neighbours
+            Worst case analysis: O(E log V) where V is the number of vertices and E is the number of edges in the network
+        """
+        offsets, head, cap, flow = self.offsets, self.head, self.cap, self.flow
+        cost, slope, potential = self.cost, self.slope, self.potential
+        unreached = 1 << 62
+        distance = array('q', [unreached]) * self.size
+        distance[source] = 0
+        heap = [(0, source)]
+        nodes = 0
+        edges = 0
+        while heap:
+            label, current_node = heappop(heap)
+            if label > distance[current_node]:
+                continue
+            nodes += 1
+            if current_node == sink:
+                break
+            base = label + potential[current_node]
+            for arc in range(offsets[current_node], offsets[current_node + 1]):
+                edges += 1
+                if cap[arc] - flow[arc] > 0:
+                    end = head[arc]
+                    reduced = base + cost[arc] + slope[arc] * flow[arc] - potential[end]
+                    if reduced < distance[end]:
+                        distance[end] = reduced
+                        heappush(heap, (reduced, end))
+        if self.stats is not None:
+            self.stats.record_search(nodes, edges)
+        limit = distance[sink]
+        if limit == unreached:
+            return False
+        for u in range(self.size):
+            potential[u] += min(distance[u], limit)
+        return True
+
+    def admissible_levels(self, source, sink):
+        """
+        Labels every node with its BFS distance from the source over the residual arcs of zero reduced cost
+
+        Return:
+            An array of levels (-1 for unreachable nodes) if the sink is reachable, None otherwise
+
+        Time complexity:
+            Best case analysis: O(V + E) where V is the number of vertices and E is the number of edges in the network
+            Worst case analysis: O(V + E) where V is the number of vertices and E is the number of edges in the network
+        """
+        offsets, head, cap, flow = self.offsets, self.head, self.cap, self.flow
+        cost, slope, potential = self.cost, self.slope, self.potential
+        queue = self.queue
+        level = array('l', [-1]) * self.size
+        level[source] = 0
+        queue[0] = source
+        front = 0
+        rear = 1
+        while front < rear:
+            current_node = queue[front]
+            front += 1
+            next_level = level[current_node] + 1
+            label = potential[current_node]
+            for arc in range(offsets[current_node], offsets[current_node + 1]):
+                end = head[arc]
+                if level[end] < 0 and cap[arc] - flow[arc] > 0 and \
+                        label + cost[arc] + slope[arc] * flow[arc] == potential[end]:
+                    level[end] = next_level
+                    queue[rear] = end
+                    rear += 1
+        if self.stats is not None:
+            self.record_search(front, False)
+        if level[sink] < 0:
+            return None
+        return level
+
+    def admissible_flow(self, source, sink, level):
+        """
+        Saturates the level graph of admissible_levels, see blocking_flow
+        An arc with a slope only takes one unit per path, as its next unit costs more and it stops being admissible
+
+        Return:
+            The amount of flow pushed from the source to the sink
+
+        Time complexity:
+            Best case analysis: O(V + E) when every path is unit capacity
+            Worst case analysis: O(V * E) where V is the number of vertices and E is the number of edges in the network
+        """
+        offsets, head, cap, flow, rev = self.offsets, self.head, self.cap, self.flow, self.rev
+        cost, slope, potential = self.cost, self.slope, self.potential
+        current = array('l', offsets)
+        total = 0
+        path = []
+        current_node = source
+        while True:
+            if current_node == sink:
+                # Push the bottleneck along the path, then retreat to the tail of the first arc that is no longer admissible
+                min_flow = min(cap[arc] - flow[arc] if slope[arc] == 0 else 1 for arc in path)
+                for arc in path:
+                    flow[arc] += min_flow
+                    flow[rev[arc]] -= min_flow
+                total += min_flow
+                if self.stats is not None:
+                    self.stats.record_path(len(path))
+                if self.should_stop is not None:
+                    self.check_stop()
+                for i in range(len(path)):
+                    if cap[path[i]] - flow[path[i]] == 0 or slope[path[i]] != 0:
+                        break
+                current_node = head[rev[path[i]]]
+                del path[i:]
+                continue
+
+            # Advance along the next admissible arc
+            arc = current[current_node]
+            end = offsets[current_node + 1]
+            next_level = level[current_node] + 1
+            label = potential[current_node]
+            while arc < end and (cap[arc] - flow[arc] <= 0 or level[head[arc]] != next_level or
+                                 label + cost[arc] + slope[arc] * flow[arc] != potential[head[arc]]):
+                arc += 1
+            current[current_node] = arc
+            if arc < end:
+                path.append(arc)
+                current_node = head[arc]
+                continue
+
+            # Dead end, retreat and skip the arc that led here
+            if not path:
+                break
+            arc = path.pop()
+            current_node = head[rev[arc]]
+            current[current_node] += 1
+        return total
+
+
+class CompactFlowNetwork(CompactGraph):
+    """
+    Array backed version of FlowNetwork
+    Builds the same network as FlowNetwork (officer nodes, allocation nodes and shift nodes), without creating a Python
+    object for every node and edge. Node ids are laid out as:
+        0: the Ford Fulkerson source, 1: the source, 2: the sink
+        officer nodes: officer_base + officer
+        shift nodes: shift_base + (company * days + day) * shifts + shift
+        allocation nodes: allocation_base + officer * days + day
+    With aggregate=True there is a single (day, shift) node shared by every company, see __init__
+    """
+    FF_SOURCE = 0
+    SOURCE = 1
+    SINK = 2
+
+    def __init__(self, preferences, officers_per_org, min_shifts, max_shifts, complete=False, aggregate=False, days=30,
+                 shifts=3, shift_requirements=None, officer_bounds=None, weights=None, fairness=0, unavailable=None):
+        """
+        Creates the compact flow network for the given inputs
+
+        Precondition: None
+        Postcondition: Creates the compact flow network for the given inputs
+
+        Input:
+            preferences: A 2D array where each subarray contains the preferences of an officer
+            officers_per_org: A 2D array where each subarray contains the number of officers required for each shift in a company
+            min_shifts: The minimum number of shifts an officer can work
+            max_shifts: The maximum number of shifts an officer can work
+            complete: If True, every allocation node gets an edge to every shift, with capacity 0 for the shifts the
+                      officer does not prefer, so preferences can be changed later with set_capacity()
+            aggregate: If True, the shift nodes of every company are merged into one node per (day, shift) whose
+                       requirement is the sum over the companies. Preferences only depend on the shift, so the flow
+                       is the same, but the allocation layer has M times fewer edges. assignments() splits the flow
+                       back over the companies
+            days: The number of days in the roster
+            shifts: The number of shifts per day
+            shift_requirements: An optional dictionary mapping (company, day, shift) to the number of officers
+                                required, overriding officers_per_org on that day
+            officer_bounds: An optional dictionary mapping an officer to their (min_shifts, max_shifts), overriding
+                            min_shifts and max_shifts for that officer
+            weights, fairness: The optional costs of MinCostFlow, see set_costs
+            unavailable: An optional iterable of (officer, day) pairs the officer cannot work, whose officer to
+                         allocation edge gets no capacity
+        Return:
+            None
+
+        Time complexity:
+            Best case analysis: O(N * M) where N is the number of officers and M is the number of companies
+            Worst case analysis: O(N * M) where N is the number of officers and M is the number of companies
+        Space complexity:
+            Input space analysis: O(N + M + K + B) where N is the number of officers, M is the number of companies, K
+                                  is the number of shift requirements and B is the number of officer bounds
+            Aux space analysis: O(N * M) where N is the number of officers and M is the number of companies
+        """
+        self.complete = complete
+        self.aggregate = aggregate
+        self.days = days
+        self.shifts = shifts
+        self.officer_count = len(preferences)
+        self.company_count = len(officers_per_org)
+        # The number of companies that have their own shift nodes
+        self.shift_companies = 1 if aggregate else self.company_count
+        self.officer_base = 3
+        self.shift_base = self.officer_base + self.officer_count
+        self.allocation_base = self.shift_base + self.shift_companies * days * shifts
+        super().__init__(self.allocation_base + self.officer_count * days)
+
+        # Edges are added in the same order as FlowNetwork.residual_network() adds them, so that every node sees its
+        # arcs in the same order and the BFS finds the same augmenting paths
+        # The capacities that depend on the requirements and the shift bounds are set by reset() once the graph is built
+        # Ford Fulkerson source to the officer nodes and to the source node
+        for i in range(self.officer_count):
+            self.add_edge(self.FF_SOURCE, self.officer_base + i, 0)
+        self.add_edge(self.FF_SOURCE, self.SOURCE, 0)
+
+        # Source node to the officer nodes
+        self.source_edges = self.edge_count
+        for i in range(self.officer_count):
+            self.add_edge(self.SOURCE, self.officer_base + i, 0)
+
+        # Officer nodes to their allocation nodes
+        # O(N) where N is the number of officers
+        self.allocation_edges = self.edge_count
+        for i in range(self.officer_count):
+            for day in range(days):
+                self.add_edge(self.officer_base + i, self.allocation_base + i * days + day, 1)
+
+        # Allocation nodes to the preferred shift of every company
+        # O(N * M) where N is the number of officers and M is the number of companies
+        self.assignment_edges = self.edge_count
+        for i in range(self.officer_count):
+            for day in range(days):
+                node = self.allocation_base + i * days + day
+                for company in range(self.shift_companies):
+                    for shift in range(shifts):
+                        if complete:
+                            self.add_edge(node, self.shift_node(company, day, shift), preferences[i][shift])
+                        elif preferences[i][shift] == 1:
+                            self.add_edge(node, self.shift_node(company, day, shift), 1)
+
+        # Shift nodes to the sink node
+        # O(M) where M is the number of companies
+        self.sink_edges = self.edge_count
+        for company in range(self.shift_companies):
+            for day in range(days):
+                for shift in range(shifts):
+                    self.add_edge(self.shift_node(company, day, shift), self.SINK, 0)
+
+        self.build()
+        self.unavailable = ()
+        self.reset(officers_per_org, min_shifts, max_shifts, shift_requirements, officer_bounds, weights, fairness,
+                   unavailable)
+
+    def reset(self, officers_per_org, min_shifts, max_shifts, shift_requirements=None, officer_bounds=None, weights=None,
+              fairness=0, unavailable=None):
+        """
+        Removes every flow and cost and sets the capacities of the requirements and shift bounds for a new solve
+        The nodes and the edges between them only depend on the officer count, the preferences, the company count, the
+        days and the shifts, so a built network can be reused for any inputs that share them, see TopologyCache
+
+        Precondition: officers_per_org has the company count the network was built with
+        Input:
+            officers_per_org, min_shifts, max_shifts, shift_requirements, officer_bounds, weights, fairness,
+                unavailable: As for the constructor
+
+        Time complexity:
+            Best case analysis: O(N + M + K + B) where N is the number of officers, M is the number of companies, K is
+                                the number of shift requirements and B is the number of officer bounds, without costs
+            Worst case analysis: O(E) where E is the number of edges in the network
+        """
+        cap, forward = self.cap, self.forward
+        self.requirements = officers_per_org
+        self.shift_requirements = shift_requirements
+        self.flow = array('l', bytes(8 * 2 * self.edge_count))
+        self.cost = None
+        self.slope = None
+        self.potential = None
+        total_req = total_requirement(officers_per_org, shift_requirements, self.days)
+        bounds = officer_bounds or {}
+        default_bounds = (min_shifts, max_shifts)
+
+        # O(N) where N is the number of officers
+        for i in range(self.officer_count):
+            officer_min, officer_max = bounds.get(i, default_bounds)
+            cap[forward[i]] = abs(officer_min)
+            cap[forward[self.source_edges + i]] = officer_max - officer_min
+        cap[forward[self.officer_count]] = abs(total_req + total_minimum(self.officer_count, min_shifts, officer_bounds))
+
+        # Reopen the days closed for the previous solve, then close the days the officers cannot work
+        for officer, day in self.unavailable:
+            cap[forward[self.allocation_edges + officer * self.days + day]] = 1
+        self.unavailable = tuple(map(tuple, unavailable or ()))
+        for officer, day in self.unavailable:
+            cap[forward[self.allocation_edges + officer * self.days + day]] = 0
+
+        # O(M) where M is the number of companies
+        if self.aggregate:
+            base, changes = daily_demand(officers_per_org, shift_requirements, self.shifts)
+        edge = self.sink_edges
+        for company in range(self.shift_companies):
+            for day in range(self.days):
+                for shift in range(self.shifts):
+                    if self.aggregate:
+                        cap[forward[edge]] = base[shift] + changes.get((day, shift), 0)
+                    else:
+                        cap[forward[edge]] = requirement(officers_per_org, shift_requirements, company, day, shift)
+                    edge += 1
+
+        if weights is not None or fairness:
+            self.set_costs(weights, fairness)
+
+    def set_costs(self, weights=None, fairness=0):
+        """
+        Sets the costs minimised by MinCostFlow
+        An assignment costs the highest weight minus the officer's weight for the shift, so the costs are never negative
+        and the cheapest allocation is the one with the most total weight. With fairness, the k-th shift an officer
+        works above their minimum shifts costs fairness * k more, which spreads the shifts evenly over the officers
+
+        Input:
+            weights: An optional 2D array where weights[i][shift] is how much officer i wants the shift (higher is
+                     better), the same for every company and day
+            fairness: The increase in cost of every further shift of an officer (0 or more)
+
+        Time complexity:
+            Best case analysis: O(E) where E is the number of edges in the network
+            Worst case analysis: O(E) where E is the number of edges in the network
+        """
+        if fairness < 0:
+            raise ValueError("fairness must not be negative")
+        if weights is not None:
+            top = max((max(officer) for officer in weights if officer), default=0)
+            for edge in range(self.assignment_edges, self.sink_edges):
+                arc = self.forward[edge]
+                officer = (self.head[self.rev[arc]] - self.allocation_base) // self.days
+                shift = (self.head[arc] - self.shift_base) % self.shifts
+                self.set_cost(edge, top - weights[officer][shift])
+        for i in range(self.officer_count):
+            self.set_cost(self.source_edges + i, 0, fairness)
+
+    def set_capacity(self, edge, capacity):
+        """
+        Changes the capacity of an edge, cancelling any flow above the new capacity, see CompactGraph.set_capacity
+
+        Return:
+            The amount of flow cancelled
+        """
+        return super().set_capacity(edge, capacity, self.FF_SOURCE, self.SINK)
+
+    def shift_node(self, company, day, shift):
+        """
+        Returns the id of the node of a shift (the company is ignored when the network is aggregated)
+        """
+        if self.aggregate:
+            company = 0
+        return self.shift_base + (company * self.days + day) * self.shifts + shift
+
+    def assignment_edge(self, officer, day, company, shift):
+        """
+        Returns the index of the edge from an allocation node to a shift node
+        Precondition: the network was built with complete=True
+        """
+        if self.aggregate:
+            company = 0
+        return self.assignment_edges + ((officer * self.days + day) * self.shift_companies + company) * self.shifts + shift
+
+    def sink_edge(self, company, day, shift):
+        """
+        Returns the index of the edge from a shift node to the sink
+        """
+        return self.sink_edges + self.shift_node(company, day, shift) - self.shift_base
+
+    def greedy_initial_flow(self):
+        """
+        Seeds the network with a greedy allocation, see FlowNetwork.greedy_initial_flow
+        Allocation nodes are visited in the same order as the object engine, so both engines seed the same flow
+
+        Return:
+            The amount of flow seeded
+
+        Time complexity:
+            Best case analysis: O(N) where N is the number of officers, when no officer can work a shift
+            Worst case analysis: O(N * M) where N is the number of officers and M is the number of companies
+        """
+        offsets, head, cap, flow, forward = self.offsets, self.head, self.cap, self.flow, self.forward
+        seeded = 0
+        for i in range(self.officer_count):
+            from_ff_source = forward[i]
+            from_source = forward[self.source_edges + i]
+            for day in range(self.days):
+                if cap[from_ff_source] - flow[from_ff_source] <= 0 and cap[from_source] - flow[from_source] <= 0:
+                    break
+                node = self.allocation_base + i * self.days + day
+                for arc in range(offsets[node], offsets[node + 1]):
+                    # Skip the backward arc to the officer node
+                    if cap[arc] > 0 and self.seed_path(i, day, arc):
+                        seeded += 1
+                        break
+        return seeded
+
+    def seed_assignment(self, officer, day, company, shift):
+        """
+        Seeds one unit of flow assigning an officer to a shift, if the network has room for it
+
+        Return:
+            True if the assignment was seeded, False otherwise
+
+        Time complexity:
+            Best case analysis: O(1)
+            Worst case analysis: O(M) where M is the number of companies
+        """
+        node = self.allocation_base + officer * self.days + day
+        shift_node = self.shift_node(company, day, shift)
+        for arc in range(self.offsets[node], self.offsets[node + 1]):
+            if self.head[arc] == shift_node and self.cap[arc] > 0:
+                return self.seed_path(officer, day, arc)
+        return False
+
+    def seed_path(self, officer, day, arc):
+        """
+        Pushes one unit of flow from the Ford Fulkerson source to the sink through the given allocation to shift arc
+        The officer is reached directly from the Ford Fulkerson source while its minimum shifts last, then through the
+        source node
+
+        Return:
+            True if every edge on the path had room for the flow, False otherwise (nothing is pushed)
+
+        Time complexity:
+            Best case analysis: O(1)
+            Worst case analysis: O(1)
+        """
+        cap, flow, forward = self.cap, self.flow, self.forward
+        from_ff_source = forward[officer]
+        from_source = forward[self.source_edges + officer]
+        to_source = forward[self.officer_count]
+        to_allocation = forward[self.allocation_edges + officer * self.days + day]
+        sink_arc = forward[self.sink_edges + self.head[arc] - self.shift_base]
+        if cap[to_allocation] - flow[to_allocation] <= 0 or cap[arc] - flow[arc] <= 0 or cap[sink_arc] - flow[sink_arc] <= 0:
+            return False
+        if cap[from_ff_source] - flow[from_ff_source] > 0:
+            self.push(from_ff_source, 1)
+        elif cap[from_source] - flow[from_source] > 0 and cap[to_source] - flow[to_source] > 0:
+            self.push(from_source, 1)
+            self.push(to_source, 1)
+        else:
+            return False
+        self.push(to_allocation, 1)
+        self.push(arc, 1)
+        self.push(sink_arc, 1)
+        return True
+
+    def FordFulkerson(self):
+        """
+        Runs the Ford Fulkerson algorithm on the network
+
+        Postcondition: Finds the maximum flow from the source node to the sink node in the network
+        Return:
+            The amount of flow pushed from the source to the sink
+
+        Time complexity:
+            Best case analysis: O(F * (V + E)) where F is the maximum flow of the network, V is the number of vertices and E is the number of edges in the network
+            Worst case analysis: O(F * (V + E)) where F is the maximum flow of the network, V is the number of vertices and E is the number of edges in the network
+        """
+        return super().FordFulkerson(self.FF_SOURCE, self.SINK)
+
+    def Dinic(self):
+        """
+        Runs Dinic's algorithm on the network, see CompactGraph.Dinic
+
+        Return:
+            The amount of flow pushed from the source to the sink
+        """
+        return super().Dinic(self.FF_SOURCE, self.SINK)
+
+    def PushRelabel(self):
+        """
+        Runs the highest label push-relabel algorithm on the network, see CompactGraph.PushRelabel
+
+        Return:
+            The amount of flow pushed from the source to the sink
+        """
+        return super().PushRelabel(self.FF_SOURCE, self.SINK)
+
+    def MinCostFlow(self):
+        """
+        Runs the min cost flow solver on the network, see CompactGraph.MinCostFlow and set_costs
+
+        Return:
+            The amount of flow pushed from the source to the sink
+        """
+        return super().MinCostFlow(self.FF_SOURCE, self.SINK)
+
+    def requirements_met(self):
+        """
+        Returns True if the flow into the sink meets the requirement of every shift node
+
+        Time complexity:
+            Best case analysis: O(1) when the first shift is not met
+            Worst case analysis: O(M) where M is the number of companies
+        """
+        for edge in range(self.sink_edges, self.edge_count):
+            arc = self.forward[edge]
+            if self.cap[arc] != self.flow[arc]:
+                return False
+        return True
+
+    def min_cut(self):
+        """
+        Explains why the flow does not meet every requirement, see FlowNetwork.min_cut
+        When the network is aggregated, unmet shifts are reported per (day, shift) node with company None
+
+        Precondition: a solver has been run
+        Return:
+            The same dictionary as FlowNetwork.min_cut
+
+        Time complexity:
+            Best case analysis: O(V + E) where V is the number of vertices and E is the number of edges in the network
+            Worst case analysis: O(V + E) where V is the number of vertices and E is the number of edges in the network
+        """
+        # A failed search leaves exactly the nodes on the source side of the cut stamped with the current epoch
+        self.PathAugmentation(self.FF_SOURCE, self.SINK)
+        offsets, head, cap, flow, visited, epoch = self.offsets, self.head, self.cap, self.flow, self.visited, self.epoch
+        report = {"flow": 0, "demand": 0, "unmet_shifts": [], "saturated_officers": [], "saturated_days": []}
+        unmet = set()
+        for edge in range(self.sink_edges, self.edge_count):
+            arc = self.forward[edge]
+            report["flow"] += flow[arc]
+            report["demand"] += cap[arc]
+            if flow[arc] < cap[arc]:
+                shift_node = head[self.rev[arc]]
+                company_day, shift = divmod(shift_node - self.shift_base, self.shifts)
+                company, day = divmod(company_day, self.days)
+                if self.aggregate:
+                    company = None
+                report["unmet_shifts"].append((company, day, shift, cap[arc], flow[arc]))
+                unmet.add(shift_node)
+        for i in range(self.officer_count):
+            if visited[self.officer_base + i] != epoch:
+                report["saturated_officers"].append(i)
+                continue
+            for day in range(self.days):
+                node = self.allocation_base + i * self.days + day
+                if visited[node] != epoch:
+                    for arc in range(offsets[node], offsets[node + 1]):
+                        if cap[arc] > 0 and head[arc] in unmet:
+                            report["saturated_days"].append((i, day))
+                            break
+        return report
+
+    def assignments(self):
+        """
+        Yields (officer, company, day, shift) for every allocation edge carrying flow
+        When the network is aggregated, the officers sent to each (day, shift) node are handed out to the companies in
+        order, each company taking as many as it requires
+
+        Time complexity:
+            Best case analysis: O(N * M) where N is the number of officers and M is the number of companies
+            Worst case analysis: O(N * M) where N is the number of officers and M is the number of companies
+        """
+        if self.aggregate:
+            # Officers are visited in order, so the next company to fill for each (day, shift) node is enough state
+            next_company = [0] * (self.days * self.shifts)
+            filled = [0] * (self.days * self.shifts)
+        for edge in range(self.assignment_edges, self.sink_edges):
+            arc = self.forward[edge]
+            if self.flow[arc] == 1:
+                allocation = self.head[self.rev[arc]] - self.allocation_base
+                company_day, shift = divmod(self.head[arc] - self.shift_base, self.shifts)
+                company, day = divmod(company_day, self.days)
+                if self.aggregate:
+                    node = day * self.shifts + shift
+                    company = next_company[node]
+                    while company < self.company_count and \
+                            filled[node] >= requirement(self.requirements, self.shift_requirements, company, day, shift):
+                        company += 1
+                        filled[node] = 0
+                    if company == self.company_count:
+                        continue
+                    next_company[node] = company
+                    filled[node] += 1
+                yield allocation // self.days, company, day, shift
@@ -0,0 +1,103 @@
+from pruning import CoreProblem
+
+def preference_components(preferences, shifts):
+    """
+    Finds the connected components of the bipartite graph between officers and the shifts they prefer
+    Two shifts are in the same component when an officer prefers both, or through a chain of such officers. Officers
+    who prefer no shift are in no component, as they can never be allocated
+
+    Input:
+        preferences: A 2D array where each subarray contains the preferences of an officer
+        shifts: The number of shifts per day
+    Return:
+        A list of (officers, shifts) pairs, the sorted officers and shifts of every component, ordered by their first
+        shift. A shift no officer prefers is a component without officers
+
+    Time complexity:
+        Best case analysis: O(N * S) where N is the number of officers and S is the number of shifts
+        Worst case analysis: O(N * S * log S) where N is the number of officers and S is the number of shifts
+    Space complexity:
+        Input space analysis: O(N * S) where N is the number of officers and S is the number of shifts
+        Aux space analysis: O(N + S) where N is the number of officers and S is the number of shifts
+    """
+    parent = list(range(shifts))
+
+    def find(shift):
+        while parent[shift] != shift:
+            # Path halving keeps the trees shallow
+            parent[shift] = parent[parent[shift]]
+            shift = parent[shift]
+        return shift
+
+    for officer in preferences:
+        first = None
+        for shift in range(shifts):
+            if officer[shift] == 1:
+                if first is None:
+                    first = find(shift)
+                else:
+                    root = find(shift)
+                    if root != first:
+                        parent[max(root, first)] = min(root, first)
+                        first = min(root, first)
+
+    members = {}
+    for shift in range(shifts):
+        members.setdefault(find(shift), ([], []))[1].append(shift)
+    for i, officer in enumerate(preferences):
+        for shift in range(shifts):
+            if officer[shift] == 1:
+                members[find(shift)][0].append(i)
+                break
+    return [members[root] for root in sorted(members)]
+
+
+def split_components(preferences, officers_per_org, days=30, shifts=3, shift_requirements=None, officer_bounds=None,
+                     unavailable=None):
+    """
+    Splits an allocation problem into independent problems, one per component of preference_components
+    No officer of one component can work a shift of another, so the components share nothing but the companies and
+    the days, and every valid allocation is the union of valid allocations of the components
+
+    Input:
+        preferences, officers_per_org, days, shifts, shift_requirements, officer_bounds, unavailable: As for allocate()
+    Return:
+        A list of CoreProblem, one per component, keeping every company and day
+
+    Time complexity:
+        Best case analysis: O(N * S + M * S + K + B + U) where N is the number of officers, M is the number of
+                            companies, S is the number of shifts and K, B and U are the number of shift requirements,
+                            officer bounds and unavailable days
+        Worst case analysis: O(N * S * log S + M * S + K + B + U)
+    """
+    parts = []
+    component_of = {}
+    position = {}
+    for index, (officers, part_shifts) in enumerate(preference_components(preferences, shifts)):
+        for k, officer in enumerate(officers):
+            component_of[officer] = index
+            position[officer] = k
+        parts.append((officers, part_shifts, {}, {}, []))
+    shift_component = {}
+    shift_position = {}
+    for index, (_, part_shifts, _, _, _) in enumerate(parts):
+        for k, shift in enumerate(part_shifts):
+            shift_component[shift] = index
+            shift_position[shift] = k
+
+    for (company, day, shift), req in (shift_requirements or {}).items():
+        parts[shift_component[shift]][2][company, day, shift_position[shift]] = req
+    for officer, bounds in (officer_bounds or {}).items():
+        if officer in component_of:
+            parts[component_of[officer]][3][position[officer]] = bounds
+    for officer, day in unavailable or ():
+        if officer in component_of:
+            parts[component_of[officer]][4].append((position[officer], day))
+
+    problems = []
+    for officers, part_shifts, requirements, bounds, closed in parts:
+        problems.append(CoreProblem([[preferences[officer][shift] for shift in part_shifts] for officer in officers],
+                                    [[company[shift] for shift in part_shifts] for company in officers_per_org], days,
+                                    requirements or None, bounds or None, closed or None, officers,
+                                    list(range(len(officers_per_org))), list(range(days)), part_shifts, []))
+    return problems
@@ -0,0 +1,95 @@
+from concurrent.futures import ProcessPoolExecutor
+from compact_network import CompactGraph
+from demand import requirements_by_day
+
+def solve_day(preferences, officers_per_org, day, days=30, day_requirements=None):
+    """
+    Solves the allocation for a single day, ignoring the minimum and maximum shifts of the officers
+    The day is a bipartite matching between officers (one shift each) and the shifts of every company. Officers are
+    tried in an order rotated by the day, so the days of a month do not all pick the same officers first
+
+    Input:
+        preferences: A 2D array where each subarray contains the preferences of an officer
+        officers_per_org: A 2D array where each subarray contains the number of officers required for each shift in a company
+        day: The day being solved
+        days: The number of days in the roster, used to rotate the officer order
+        day_requirements: An optional dictionary mapping (company, shift) to the number of officers required on the
+                          day, overriding officers_per_org
+    Return:
+        A list of (officer, company, shift) assignments for the day
+
+    Time complexity:
+        Best case analysis: O(N * M) where N is the number of officers and M is the number of companies
+        Worst case analysis: O((N * M) * sqrt(N + M)) where N is the number of officers and M is the number of companies
+    Space complexity:
+        Input space analysis: O(N + M) where N is the number of officers and M is the number of companies
+        Aux space analysis: O(N * M) where N is the number of officers and M is the number of companies
+    """
+    officer_count = len(preferences)
+    company_count = len(officers_per_org)
+    # 0 is the source, 1 is the sink, then one node per officer and one per company shift
+    shifts = len(officers_per_org[0]) if officers_per_org else 0
+    shift_base = 2 + officer_count
+    graph = CompactGraph(shift_base + company_count * shifts)
+    start = day * officer_count // days if officer_count else 0
+    for k in range(officer_count):
+        i = (start + k) % officer_count
+        graph.add_edge(0, 2 + i, 1)
+        for company in range(company_count):
+            for shift in range(shifts):
+                if preferences[i][shift] == 1:
+                    graph.add_edge(2 + i, shift_base + company * shifts + shift, 1)
+    for company in range(company_count):
+        for shift in range(shifts):
+            req = officers_per_org[company][shift]
+            if day_requirements:
+                req = day_requirements.get((company, shift), req)
+            graph.add_edge(shift_base + company * shifts + shift, 1, req)
+    graph.build()
+    graph.Dinic(0, 1)
+
+    assignments = []
+    for i in range(officer_count):
+        node = 2 + i
+        for arc in range(graph.offsets[node], graph.offsets[node + 1]):
+            if graph.flow[arc] == 1 and graph.head[arc] >= shift_base:
+                company, shift = divmod(graph.head[arc] - shift_base, shifts)
+                assignments.append((i, company, shift))
+    return assignments
+
+
+def seed_days(network, preferences, officers_per_org, workers=None, days=30, shift_requirements=None):
+    """
+    Seeds a CompactFlowNetwork with per-day allocations solved in parallel
+    Days only interact through the maximum shifts of each officer, so every day is solved on its own across a process
+    pool. The day results are then merged in day order, dropping any assignment that would take an officer over their
+    maximum shifts. The seeded flow is a valid flow of the full network, so running a solver afterwards acts as the
+    coordinating flow that reassigns the dropped shifts
+
+    Input:
+        network: An unsolved CompactFlowNetwork built from the same inputs
+        preferences: A 2D array where each subarray contains the preferences of an officer
+        officers_per_org: A 2D array where each subarray contains the number of officers required for each shift in a company
+        workers: The number of worker processes, defaults to the number of CPUs
+        days: The number of days in the roster
+        shift_requirements: The optional (company, day, shift) requirements of allocate(), each day is only sent the
+                            requirements of that day
+    Return:
+        The amount of flow seeded
+
+    Time complexity:
+        Best case analysis: O(D * N * M / W) where D is the number of days and W is the number of workers
+        Worst case analysis: O(D * (N * M) * sqrt(N + M) / W) where D is the number of days and W is the number of workers
+    Space complexity:
+        Input space analysis: O(1)
+        Aux space analysis: O(N * M) where N is the number of officers and M is the number of companies
+    """
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(solve_day, [preferences] * days, [officers_per_org] * days, range(days), [days] * days,
+                               requirements_by_day(shift_requirements, days))
+        seeded = 0
+        for day, assignments in zip(range(days), results):
+            for officer, company, shift in assignments:
+                if network.seed_assignment(officer, day, company, shift):
+                    seeded += 1
+    return seeded
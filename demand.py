@@ -0,0 +1,148 @@
+def check_overrides(officer_count, company_count, days, shifts, shift_requirements=None, officer_bounds=None,
+                    unavailable=None):
+    """
+    Raises a ValueError if an override of allocate() refers to a company, day, shift or officer that does not exist
+
+    Input:
+        officer_count: The number of officers
+        company_count: The number of companies
+        days: The number of days in the roster
+        shifts: The number of shifts per day
+        shift_requirements: An optional dictionary mapping (company, day, shift) to the number of officers required
+        officer_bounds: An optional dictionary mapping an officer to their (min_shifts, max_shifts)
+        unavailable: An optional iterable of (officer, day) pairs the officer cannot work
+
+    Time complexity:
+        Best case analysis: O(K + B + U) where K is the number of shift requirements, B the number of officer bounds
+                            and U the number of unavailable days
+        Worst case analysis: O(K + B + U) where K is the number of shift requirements, B the number of officer bounds
+                             and U the number of unavailable days
+    """
+    for key in shift_requirements or ():
+        company, day, shift = key
+        if not (0 <= company < company_count and 0 <= day < days and 0 <= shift < shifts):
+            raise ValueError("Shift requirement for an unknown (company, day, shift): " + str(key))
+    for officer in officer_bounds or ():
+        if not 0 <= officer < officer_count:
+            raise ValueError("Shift bounds for an unknown officer: " + str(officer))
+    for officer, day in unavailable or ():
+        if not (0 <= officer < officer_count and 0 <= day < days):
+            raise ValueError("Unavailable day for an unknown (officer, day): " + str((officer, day)))
+
+
+def requirement(officers_per_org, shift_requirements, company, day, shift):
+    """
+    Returns the number of officers a company requires for a shift on a day: the override if there is one, otherwise
+    the requirement of the shift repeated over every day
+    """
+    if shift_requirements:
+        return shift_requirements.get((company, day, shift), officers_per_org[company][shift])
+    return officers_per_org[company][shift]
+
+
+def total_requirement(officers_per_org, shift_requirements, days):
+    """
+    Returns the number of officers required over every company, day and shift
+
+    Time complexity:
+        Best case analysis: O(M + K) where M is the number of companies and K is the number of shift requirements
+        Worst case analysis: O(M + K) where M is the number of companies and K is the number of shift requirements
+    """
+    total = 0
+    for company in officers_per_org:
+        total += days * sum(company)
+    for (company, day, shift), req in (shift_requirements or {}).items():
+        total += req - officers_per_org[company][shift]
+    return total
+
+
+def total_minimum(officer_count, min_shifts, officer_bounds):
+    """
+    Returns the sum of the minimum shifts of every officer
+    """
+    total = officer_count * min_shifts
+    for bounds in (officer_bounds or {}).values():
+        total += bounds[0] - min_shifts
+    return total
+
+
+def daily_demand(officers_per_org, shift_requirements, shifts):
+    """
+    Returns the requirement of every shift summed over the companies, as the default of every day plus the changes of
+    the days that have overrides
+
+    Return:
+        (base, changes) where base[shift] is the default daily demand of a shift, and changes maps (day, shift) to the
+        difference from base on that day (only for the days with an override)
+
+    Time complexity:
+        Best case analysis: O(M + K) where M is the number of companies and K is the number of shift requirements
+        Worst case analysis: O(M + K) where M is the number of companies and K is the number of shift requirements
+    """
+    base = [0] * shifts
+    for company in officers_per_org:
+        for shift in range(shifts):
+            base[shift] += company[shift]
+    changes = {}
+    for (company, day, shift), req in (shift_requirements or {}).items():
+        changes[day, shift] = changes.get((day, shift), 0) + req - officers_per_org[company][shift]
+    return base, changes
+
+
+def requirements_by_day(shift_requirements, days):
+    """
+    Splits the shift requirements into one dictionary per day mapping (company, shift) to the requirement, so a day can
+    be solved without the overrides of the other days
+
+    Time complexity:
+        Best case analysis: O(D + K) where D is the number of days and K is the number of shift requirements
+        Worst case analysis: O(D + K) where D is the number of days and K is the number of shift requirements
+    """
+    by_day = [{} for _ in range(days)]
+    for (company, day, shift), req in (shift_requirements or {}).items():
+        by_day[day][company, shift] = req
+    return by_day
+
+
+def shortfall(assignments, officer_count, officers_per_org, min_shifts, days, shifts, shift_requirements=None,
+              officer_bounds=None):
+    """
+    Reports the demand a partial allocation leaves unmet
+
+    Input:
+        assignments: An iterable of (officer, company, day, shift) tuples
+        officer_count, officers_per_org, min_shifts, days, shifts, shift_requirements, officer_bounds: As for allocate()
+    Return:
+        A dictionary with:
+            assigned: The number of shifts assigned
+            demand: The total requirement of every shift
+            unmet_shifts: A list of (company, day, shift, req, assigned) for every shift below its requirement
+            under_minimum: A list of (officer, min_shifts, assigned) for every officer below their minimum shifts
+
+    Time complexity:
+        Best case analysis: O(A + N + M) where A is the number of assignments, N is the number of officers and M is
+                            the number of companies
+        Worst case analysis: O(A + N + M) where A is the number of assignments, N is the number of officers and M is
+                             the number of companies
+    """
+    company_count = len(officers_per_org)
+    covered = [0] * (company_count * days * shifts)
+    worked = [0] * officer_count
+    for officer, company, day, shift in assignments:
+        covered[(company * days + day) * shifts + shift] += 1
+        worked[officer] += 1
+    report = {"assigned": sum(worked), "demand": total_requirement(officers_per_org, shift_requirements, days),
+              "unmet_shifts": [], "under_minimum": []}
+    for company in range(company_count):
+        for day in range(days):
+            for shift in range(shifts):
+                req = requirement(officers_per_org, shift_requirements, company, day, shift)
+                assigned = covered[(company * days + day) * shifts + shift]
+                if assigned < req:
+                    report["unmet_shifts"].append((company, day, shift, req, assigned))
+    bounds = officer_bounds or {}
+    for officer in range(officer_count):
+        officer_min = bounds.get(officer, (min_shifts, None))[0]
+        if worked[officer] < officer_min:
+            report["under_minimum"].append((officer, officer_min, worked[officer]))
+    return report
@@ -0,0 +1,104 @@
+from demand import daily_demand, total_requirement
+
+def officer_capacity(officer_preferences, min_shifts, max_shifts, days=30):
+    """
+    Returns the most shifts the network can give an officer: the capacity of the edges into the officer node, capped at
+    one shift per day (0 if the officer prefers no shift). days is the number of days the officer is available
+    """
+    if 1 not in officer_preferences:
+        return 0
+    return min(days, abs(min_shifts) + max(0, max_shifts - min_shifts))
+
+
+def precheck(preferences, officers_per_org, min_shifts, max_shifts, days=30, shifts=3, shift_requirements=None,
+             officer_bounds=None, unavailable=None):
+    """
+    Runs necessary conditions for an allocation to exist, without building the flow network
+    Failing any of them means allocate() would return None, passing them does not guarantee an allocation exists
+
+    Checks:
+        shift: The officers preferring a shift can cover its busiest daily demand summed over every company
+        day: The officers that can work at all can cover the total demand of the busiest day (one shift each per day)
+        total: The officers' shift capacity covers the total demand over every day
+
+    Input:
+        preferences: A 2D array where each subarray contains the preferences of an officer
+        officers_per_org: A 2D array where each subarray contains the number of officers required for each shift in a company
+        min_shifts: The minimum number of shifts an officer can work
+        max_shifts: The maximum number of shifts an officer can work
+        days: The number of days in the roster
+        shifts: The number of shifts per day
+        shift_requirements, officer_bounds, unavailable: The optional overrides of allocate(), the unavailable days
+            of an officer are taken off their capacity
+    Return:
+        None if every check passes, otherwise a dictionary describing the first check that failed:
+            check: The name of the check ("shift", "day" or "total")
+            shift: The shift that cannot be covered (the "shift" check only)
+            day: The busiest day of the shift or of the roster (the "shift" and "day" checks only)
+            demand: The demand that cannot be covered
+            capacity: The most the officers can cover
+
+    Time complexity:
+        Best case analysis: O(N + M + K + U) where N is the number of officers, M is the number of companies, K is the
+                            number of shift requirements and U is the number of unavailable days
+        Worst case analysis: O(N + M + K + U) where N is the number of officers, M is the number of companies, K is the
+                             number of shift requirements and U is the number of unavailable days
+    Space complexity:
+        Input space analysis: O(N + M + K + U) where N is the number of officers, M is the number of companies, K is
+                              the number of shift requirements and U is the number of unavailable days
+        Aux space analysis: O(K + U) where K is the number of shift requirements and U is the number of unavailable
+                            days
+    """
+    base, changes = daily_demand(officers_per_org, shift_requirements, shifts)
+    # The busiest day of each shift and of the roster, only the days with an override can differ from the base
+    # O(K) where K is the number of shift requirements
+    peak = [(base[shift], first_default_day(changes, shift, days)) for shift in range(shifts)]
+    day_changes = {}
+    for (day, shift), change in changes.items():
+        if peak[shift][1] is None or base[shift] + change > peak[shift][0]:
+            peak[shift] = (base[shift] + change, day)
+        day_changes[day] = day_changes.get(day, 0) + change
+    busiest_day = (sum(base), first_default_day(day_changes, None, days))
+    for day, change in day_changes.items():
+        if busiest_day[1] is None or sum(base) + change > busiest_day[0]:
+            busiest_day = (sum(base) + change, day)
+
+    bounds = officer_bounds or {}
+    # O(U) where U is the number of unavailable days, every pair is counted once
+    closed = {}
+    for officer, _ in set(map(tuple, unavailable or ())):
+        closed[officer] = closed.get(officer, 0) + 1
+    eligible = [0] * shifts
+    available = 0
+    total_capacity = 0
+    for i, officer in enumerate(preferences):
+        officer_min, officer_max = bounds.get(i, (min_shifts, max_shifts))
+        capacity = officer_capacity(officer, officer_min, officer_max, days - closed.get(i, 0))
+        if capacity > 0:
+            available += 1
+            total_capacity += capacity
+            for shift in range(shifts):
+                if officer[shift] == 1:
+                    eligible[shift] += 1
+
+    for shift in range(shifts):
+        demand, day = peak[shift]
+        if demand > eligible[shift]:
+            return {"check": "shift", "shift": shift, "day": day, "demand": demand, "capacity": eligible[shift]}
+    if busiest_day[0] > available:
+        return {"check": "day", "day": busiest_day[1], "demand": busiest_day[0], "capacity": available}
+    total = total_requirement(officers_per_org, shift_requirements, days)
+    if total > total_capacity:
+        return {"check": "total", "demand": total, "capacity": total_capacity}
+    return None
+
+
+def first_default_day(changes, shift, days):
+    """
+    Returns the first day without an entry in changes (keyed by (day, shift), or by day when shift is None), or None if
+    every day has one
+    """
+    for day in range(days):
+        if ((day, shift) if shift is not None else day) not in changes:
+            return day
+    return None
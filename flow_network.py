@@ -1,9 +1,13 @@
+from arrayr import ArrayR
+from demand import requirement
+from interrupt import SolveInterrupted
 from circular_queue import CircularQueue
 from edges import *
 from nodes import *
 
 class FlowNetwork:
-    def __init__(self, preferences, officers_per_org, min_shifts, max_shifts):
+    def __init__(self, preferences, officers_per_org, min_shifts, max_shifts, days=30, shifts=3, shift_requirements=None,
+                 officer_bounds=None, unavailable=None):
         """
         Creates the flow network for the given inputs
 
@@ -17,6 +21,14 @@ class FlowNetwork:
             officers_per_org: A 2D array where each subarray contains the number of officers required for each shift in a company
             min_shifts: The minimum number of shifts an officer can work
             max_shifts: The maximum number of shifts an officer can work
+            days: The number of days in the roster
+            shifts: The number of shifts per day
+            shift_requirements: An optional dictionary mapping (company, day, shift) to the number of officers
+                                required, overriding officers_per_org on that day
+            officer_bounds: An optional dictionary mapping an officer to their (min_shifts, max_shifts), overriding
+                            min_shifts and max_shifts for that officer
+            unavailable: An optional iterable of (officer, day) pairs the officer cannot work, whose officer to
+                         allocation edge gets no capacity
         Return:
             None
 
@@ -34,11 +46,18 @@ class FlowNetwork:
         self.officer_nodes = []
         self.allocation_nodes = []
         self.size = 0
+        self.days = days
+        self.shifts = shifts
+        self.rn_sink = None
+        # Set to a SolverStats to record the searches and augmenting paths of FordFulkerson
+        self.stats = None
+        # Set to a function to stop FordFulkerson between augmenting paths once it returns True
+        self.should_stop = None
 
         # Security officer nodes are stored in a 1D array
         # O(N) where N is the number of officers
         for i in range(len(preferences)):
-            node = OfficerNode(i, preferences[i])
+            node = OfficerNode(i)
             self.officer_nodes.append(node)
             self.size += 1
         
@@ -46,24 +65,26 @@ class FlowNetwork:
         # O(M) where M is the number of companies
         for i in range(len(officers_per_org)):
             self.shift_nodes.append([])
-            for day in range(30):
-                self.shift_nodes[i].append([ShiftNode(i, day, 0, officers_per_org[i][0]), ShiftNode(i, day, 1, officers_per_org[i][1]), ShiftNode(i, day, 2, officers_per_org[i][2])])
-                self.size += 3
+            for day in range(days):
+                self.shift_nodes[i].append([ShiftNode(i, day, shift, requirement(officers_per_org, shift_requirements, i, day, shift))
+                                            for shift in range(shifts)])
+                self.size += shifts
 
         # Allocation nodes are stored in a 2D array [i][j] where i is the officer and j is the day
         # This allocation node helps determine which shift the officer is allocated to for the day
         # The allocation node is connected to the officer node and the shift node via edges
         # O(N * M) where N is the number of officers and M is the number of companies
+        closed = set(map(tuple, unavailable or ()))
         for officer in self.officer_nodes:
             self.allocation_nodes.append([])
-            for day in range(30):
+            for day in range(days):
                 node = AllocationNode(officer.officer, day)
                 self.allocation_nodes[officer.officer].append(node)
                 self.size += 1
-                officer.add_edge(Edge(officer, node, 0, 1))
+                officer.add_edge(Edge(officer, node, 0, 0 if (officer.officer, day) in closed else 1))
                 for company_shifts in self.shift_nodes:
-                    for i in range(len(officer.preferences)):
-                        if officer.preferences[i] == 1:
+                    for i in range(len(preferences[officer.officer])):
+                        if preferences[officer.officer][i] == 1:
                             node.add_edge(Edge(node, company_shifts[day][i], 0, 1))
 
         # Connect the shift nodes to the sink node
@@ -80,10 +101,12 @@ class FlowNetwork:
 
         # Connect the source node to the officer nodes
         # O(N) where N is the number of officers
+        bounds = officer_bounds or {}
         for officer in self.officer_nodes:
-            self.source.add_edge(Edge(self.source, officer, 0, max_shifts - min_shifts))
-            officer.demand -= min_shifts
-            self.source.demand -= min_shifts
+            officer_min, officer_max = bounds.get(officer.officer, (min_shifts, max_shifts))
+            self.source.add_edge(Edge(self.source, officer, 0, officer_max - officer_min))
+            officer.demand -= officer_min
+            self.source.demand -= officer_min
             self.ff_source.add_edge(Edge(self.ff_source, officer, 0, abs(officer.demand)))
         
         # Connect the source node to the new source node which will be used in Ford Fulkerson
@@ -111,6 +134,11 @@ class FlowNetwork:
         self.rn_shift_nodes = []
         self.rn_allocation_nodes = []
 
+        # BFS buffers shared by every search, sized for every node including the three source/sink nodes
+        self.epoch = 0
+        self.queue = CircularQueue(self.size + 3)
+        self.path = ArrayR(self.size + 3)
+
         # Copy the nodes from the flow network to the residual network
         for officer in self.officer_nodes:
             node = RN_Node(officer)
@@ -135,16 +163,16 @@ class FlowNetwork:
         for edge in self.ff_source.edges:
             end_node = edge.end
             if end_node != self.source:
-                forward_edge = RN_Edge(self.rn_ff_source, self.rn_officer_nodes[end_node.officer], edge.residual_capacity(), 0, edge)
-                backward_edge = RN_Edge(self.rn_officer_nodes[end_node.officer], self.rn_ff_source, edge.flow, 1, edge)
+                forward_edge = RN_Edge(self.rn_ff_source, self.rn_officer_nodes[end_node.officer], 0, edge)
+                backward_edge = RN_Edge(self.rn_officer_nodes[end_node.officer], self.rn_ff_source, 1, edge)
                 forward_edge.set_compliment(backward_edge)
                 backward_edge.set_compliment(forward_edge)
                 self.rn_ff_source.add_edge(forward_edge)
                 self.rn_officer_nodes[end_node.officer].add_edge(backward_edge)
 
             else:
-                forward_edge = RN_Edge(self.rn_ff_source, self.rn_source, edge.residual_capacity(), 0, edge)
-                backward_edge = RN_Edge(self.rn_source, self.rn_ff_source, edge.flow, 1, edge)
+                forward_edge = RN_Edge(self.rn_ff_source, self.rn_source, 0, edge)
+                backward_edge = RN_Edge(self.rn_source, self.rn_ff_source, 1, edge)
                 forward_edge.set_compliment(backward_edge)
                 backward_edge.set_compliment(forward_edge)
                 self.rn_ff_source.add_edge(forward_edge)
@@ -152,8 +180,8 @@ class FlowNetwork:
         
         for edge in self.source.edges:
             end_node = edge.end
-            forward_edge = RN_Edge(self.rn_source, self.rn_officer_nodes[end_node.officer], edge.residual_capacity(), 0, edge)
-            backward_edge = RN_Edge(self.rn_officer_nodes[end_node.officer], self.rn_source, edge.flow, 1, edge)
+            forward_edge = RN_Edge(self.rn_source, self.rn_officer_nodes[end_node.officer], 0, edge)
+            backward_edge = RN_Edge(self.rn_officer_nodes[end_node.officer], self.rn_source, 1, edge)
             forward_edge.set_compliment(backward_edge)
             backward_edge.set_compliment(forward_edge)
             self.rn_source.add_edge(forward_edge)
@@ -162,8 +190,8 @@ class FlowNetwork:
         for officer in self.officer_nodes:
             for edge in officer.edges:
                 end_node = edge.end
-                forward_edge = RN_Edge(self.rn_officer_nodes[officer.officer], self.rn_allocation_nodes[officer.officer][end_node.day], edge.residual_capacity(), 0, edge)
-                backward_edge = RN_Edge(self.rn_allocation_nodes[officer.officer][end_node.day], self.rn_officer_nodes[officer.officer], edge.flow, 1, edge)
+                forward_edge = RN_Edge(self.rn_officer_nodes[officer.officer], self.rn_allocation_nodes[officer.officer][end_node.day], 0, edge)
+                backward_edge = RN_Edge(self.rn_allocation_nodes[officer.officer][end_node.day], self.rn_officer_nodes[officer.officer], 1, edge)
                 forward_edge.set_compliment(backward_edge)
                 backward_edge.set_compliment(forward_edge)
                 self.rn_officer_nodes[officer.officer].add_edge(forward_edge)
@@ -173,8 +201,8 @@ class FlowNetwork:
             for day in allocation:
                 for edge in day.edges:
                     end_node = edge.end
-                    forward_edge = RN_Edge(self.rn_allocation_nodes[edge.start.officer][end_node.day], self.rn_shift_nodes[end_node.company][end_node.day][end_node.shift], edge.residual_capacity(), 0, edge)
-                    backward_edge = RN_Edge(self.rn_shift_nodes[end_node.company][end_node.day][end_node.shift], self.rn_allocation_nodes[edge.start.officer][end_node.day], edge.flow, 1, edge)
+                    forward_edge = RN_Edge(self.rn_allocation_nodes[edge.start.officer][end_node.day], self.rn_shift_nodes[end_node.company][end_node.day][end_node.shift], 0, edge)
+                    backward_edge = RN_Edge(self.rn_shift_nodes[end_node.company][end_node.day][end_node.shift], self.rn_allocation_nodes[edge.start.officer][end_node.day], 1, edge)
                     forward_edge.set_compliment(backward_edge)
                     backward_edge.set_compliment(forward_edge)
                     self.rn_allocation_nodes[edge.start.officer][end_node.day].add_edge(forward_edge)
@@ -184,20 +212,68 @@ class FlowNetwork:
             for day in company:
                 for shift in day:
                     for edge in shift.edges:
-                        forward_edge = RN_Edge(self.rn_shift_nodes[shift.company][shift.day][shift.shift], self.rn_sink, edge.residual_capacity(), 0, edge)
-                        backward_edge = RN_Edge(self.rn_sink, self.rn_shift_nodes[shift.company][shift.day][shift.shift], edge.flow, 1, edge)
+                        forward_edge = RN_Edge(self.rn_shift_nodes[shift.company][shift.day][shift.shift], self.rn_sink, 0, edge)
+                        backward_edge = RN_Edge(self.rn_sink, self.rn_shift_nodes[shift.company][shift.day][shift.shift], 1, edge)
                         forward_edge.set_compliment(backward_edge)
                         backward_edge.set_compliment(forward_edge)
                         self.rn_shift_nodes[shift.company][shift.day][shift.shift].add_edge(forward_edge)
                         self.rn_sink.add_edge(backward_edge)
     
 
+    def greedy_initial_flow(self):
+        """
+        Seeds the flow network with a greedy allocation before Ford Fulkerson is run
+        Each allocation node is assigned to the first preferred shift that still has room, for as long as its officer
+        has shifts left. The seeded flow is a valid flow, so Ford Fulkerson only needs to augment the remaining deficit
+
+        Precondition: None
+        Postcondition: Sets the flow of the edges on every seeded source to sink path
+        Return:
+            The amount of flow seeded
+
+        Time complexity:
+            Best case analysis: O(N) where N is the number of officers, when no officer can work a shift
+            Worst case analysis: O(N * M) where N is the number of officers and M is the number of companies
+        Space complexity:
+            Input space analysis: O(1)
+            Aux space analysis: O(1)
+        """
+        seeded = 0
+        to_source = self.ff_source.edges[-1]
+        for officer in self.officer_nodes:
+            # The officer can be reached directly from the Ford Fulkerson source or through the source node
+            from_ff_source = self.ff_source.edges[officer.officer]
+            from_source = self.source.edges[officer.officer]
+            for edge in officer.edges:
+                if from_ff_source.residual_capacity() <= 0 and from_source.residual_capacity() <= 0:
+                    break
+                # The officer cannot work this day
+                if edge.residual_capacity() <= 0:
+                    continue
+                for shift_edge in edge.end.edges:
+                    sink_edge = shift_edge.end.edges[0]
+                    if sink_edge.residual_capacity() > 0:
+                        if from_ff_source.residual_capacity() > 0:
+                            from_ff_source.flow += 1
+                        else:
+                            from_source.flow += 1
+                            to_source.flow += 1
+                        edge.flow += 1
+                        shift_edge.flow += 1
+                        sink_edge.flow += 1
+                        seeded += 1
+                        break
+        return seeded
+
+
     def FordFulkerson(self):
         """
         Runs the Ford Fulkerson algorithm on the flow network
 
         Precondition: None
         Postcondition: Finds the maximum flow from the source node to the sink node in the network
+        Return:
+            The amount of flow added by the augmenting paths (not counting any flow seeded beforehand)
 
         Time complexity:
             Best case analysis: O(F * E + (V + E)) where F is the maximum flow of the network, V is the number of vertices and E is the number of edges in the network
@@ -206,45 +282,54 @@ class FlowNetwork:
             Input space analysis: O(1)
             Aux space analysis: O(V + E) where V is the number of vertices and E is the number of edges in the network
         """
-        # Create the residual network for the flow network
+        # Create the residual network for the flow network, unless it has already been created
         # O(V + E)
-        self.residual_network()
+        if self.rn_sink is None:
+            self.residual_network()
 
         # Run the Ford Fulkerson algorithm
         # 
+        total = 0
         while True:
+            # Stop before the next path if asked to, the flow found so far is kept
+            if self.should_stop is not None and self.should_stop():
+                raise SolveInterrupted(getattr(self.should_stop, "reason", None) or "cancelled")
+
             # Find an augmenting path in the residual network 
             # If no path to the sink node is found, break the loop
             if not self.PathAugmentation(self.rn_ff_source, self.rn_sink):
                 break
 
+            # Find the minimum flow in the augmenting path, storing the path in the preallocated buffer
             current_node = self.rn_sink
             min_flow = float('inf')
-            
-            # Find the minimum flow in the augmenting path and update the flow values in both networks
+            length = 0
             while current_node != self.rn_ff_source:
                 edge = current_node.edge_taken
                 min_flow = min(min_flow, edge.value)
+                self.path[length] = edge
+                length += 1
                 current_node = edge.start
-            current_node = self.rn_sink
-            while current_node != self.rn_ff_source:
-                edge = current_node.edge_taken
+            if self.stats is not None:
+                self.stats.record_path(length)
+
+            # Update the flow values in both networks
+            for i in range(length):
+                edge = self.path[i]
                 # If the edge is a forward edge increment the flow value, else decrement
-                if edge.type == 0:
-                    edge.update(min_flow)
-                    edge.compliment_edge.value += min_flow
-                else:
-                    edge.update(min_flow)
-                    edge.compliment_edge.update(min_flow)
-                current_node = edge.start
-            self.reset_visited()
+                # The residual values of the edge and its compliment are derived from the flow, so both follow
+                edge.update(min_flow)
+            total += min_flow
+        return total
 
 
     def PathAugmentation(self, node, sink):
         """
         Finds an augmenting path in the residual network using BFS
+        Each search starts a new epoch, and a node counts as visited only if its visited stamp equals the current
+        epoch, so no reset pass is needed between searches. The queue is preallocated by residual_network()
 
-        Precondition: None
+        Precondition: residual_network() has been called
         Postcondition: Finds the shortest path (or lack thereof) from the start node to end node in the network 
 
         Input:
@@ -260,46 +345,136 @@ class FlowNetwork:
             Input space analysis: O(1)
             Aux space analysis: O(1)
         """
-        queue = CircularQueue(self.size)
-        node.visited = True
+        self.epoch += 1
+        epoch = self.epoch
+        queue = self.queue
+        queue.clear()
+        node.visited = epoch
         queue.append(node)
         while queue.length > 0:
             current_node = queue.serve()
             if current_node == sink:
-                queue.clear()
+                if self.stats is not None:
+                    self.record_search(True)
                 return True
             for edge in current_node.edges:
-                if not edge.end.visited:
+                if edge.end.visited != epoch:
                     if edge.value > 0:
-                        edge.end.visited = True
+                        edge.end.visited = epoch
                         # Update the node to store the edge taken to reach the node
                         edge.end.edge_taken = edge
                         queue.append(edge.end)
-        queue.clear()
+        if self.stats is not None:
+            self.record_search(False)
         return False
+
+
+    def record_search(self, found):
+        """
+        Records the search that just finished in the stats
+        The queue is cleared before every search and never wraps around, so the served nodes are the first queue.front
+        entries of its array (the last one is the sink when found is True, and its edges were not scanned)
+        """
+        queue = self.queue
+        served = queue.front
+        if found and served == 0:
+            # Every node was served, so front wrapped around to the start of the array
+            served = len(queue.array)
+        edges = 0
+        for i in range(served - 1 if found else served):
+            edges += len(queue.array[i].edges)
+        self.stats.record_search(served, edges)
     
 
     def reset_visited(self):
         """
-        Resets the visited attribute of all nodes in the residual network
+        Resets the visited attribute of all nodes in the residual network by starting a new epoch
 
         Time complexity: 
-            Best case analysis: O(V) where V is the number of vertices in the network
-            Worst case analysis: O(V) where V is the number of vertices in the network 
+            Best case analysis: O(1)
+            Worst case analysis: O(1)
         Space complexity: 
             Input space analysis: O(1)
             Aux space analysis: O(1)
         """
-        self.rn_ff_source.visited = False
-        self.rn_source.visited = False
-        self.rn_sink.visited = False
-        for node in self.rn_officer_nodes:
-            node.visited = False
-        for allocation in self.rn_allocation_nodes:
-            for node in allocation:
-                node.visited = False
-        for company in self.rn_shift_nodes:
+        self.epoch += 1
+
+
+    def requirements_met(self):
+        """
+        Returns True if the flow into the sink meets the requirement of every shift node
+
+        Time complexity:
+            Best case analysis: O(1) when the first shift is not met
+            Worst case analysis: O(M) where M is the number of companies
+        """
+        for node in self.shift_nodes:
+            for day in node:
+                for shift in day:
+                    if shift.req != shift.edges[0].flow:
+                        return False
+        return True
+
+
+    def assignments(self):
+        """
+        Yields (officer, company, day, shift) for every allocation edge carrying flow
+
+        Time complexity:
+            Best case analysis: O(N * M) where N is the number of officers and M is the number of companies
+            Worst case analysis: O(N * M) where N is the number of officers and M is the number of companies
+        """
+        for allocation in self.allocation_nodes:
+            for day in allocation:
+                for edge in day.edges:
+                    if edge.flow == 1:
+                        yield edge.start.officer, edge.end.company, edge.end.day, edge.end.shift
+
+
+    def min_cut(self):
+        """
+        Explains why the flow does not meet every requirement, using the minimum cut of the final residual network
+        The cut separates the nodes still reachable from the Ford Fulkerson source from the rest. Its edges are the
+        bottlenecks: officers that already work their maximum shifts, and officer days already taken by another shift
+
+        Precondition: FordFulkerson() has been run
+        Return:
+            A dictionary with:
+                flow: The flow reaching the sink
+                demand: The total requirement of every shift
+                unmet_shifts: A list of (company, day, shift, req, assigned) for every shift below its requirement
+                saturated_officers: The officers cut off from the source because they work their maximum shifts
+                saturated_days: The (officer, day) pairs that could work an unmet shift but already work that day
+
+        Time complexity:
+            Best case analysis: O(V + E) where V is the number of vertices and E is the number of edges in the network
+            Worst case analysis: O(V + E) where V is the number of vertices and E is the number of edges in the network
+        Space complexity:
+            Input space analysis: O(1)
+            Aux space analysis: O(V) where V is the number of vertices in the network
+        """
+        # A failed search leaves exactly the nodes on the source side of the cut marked as visited
+        self.PathAugmentation(self.rn_ff_source, self.rn_sink)
+        epoch = self.epoch
+        report = {"flow": 0, "demand": 0, "unmet_shifts": [], "saturated_officers": [], "saturated_days": []}
+        unmet = set()
+        for company in self.shift_nodes:
             for day in company:
                 for shift in day:
-                    shift.visited = False
-                        
\ No newline at end of file
+                    report["flow"] += shift.edges[0].flow
+                    report["demand"] += shift.req
+                    if shift.edges[0].flow < shift.req:
+                        report["unmet_shifts"].append((shift.company, shift.day, shift.shift, shift.req, shift.edges[0].flow))
+                        unmet.add(shift)
+        for officer in self.rn_officer_nodes:
+            if officer.visited != epoch:
+                report["saturated_officers"].append(officer.corresponding_node.officer)
+        for officer in self.rn_allocation_nodes:
+            for node in officer:
+                allocation = node.corresponding_node
+                if self.rn_officer_nodes[allocation.officer].visited == epoch and node.visited != epoch:
+                    for edge in allocation.edges:
+                        if edge.end in unmet:
+                            report["saturated_days"].append((allocation.officer, allocation.day))
+                            break
+        return report
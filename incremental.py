@@ -0,0 +1,190 @@
+from allocation_system import SOLVERS, build_output, shift_count
+from compact_network import CompactFlowNetwork
+from demand import check_overrides, requirement, total_minimum, total_requirement
+
+class IncrementalAllocator:
+    """
+    Keeps a solved CompactFlowNetwork between roster changes
+    Every update changes edge capacities in place. Flow above a lowered capacity is cancelled along a single path and
+    the solver is run again from the remaining flow, so a small change only costs the augmentations it needs instead
+    of a full rebuild and solve.
+
+    Example:
+        allocator = IncrementalAllocator(preferences, officers_per_org, min_shifts, max_shifts)
+        allocator.set_requirement(0, 2, 3)
+        allocation = allocator.allocation()
+    """
+    def __init__(self, preferences, officers_per_org, min_shifts, max_shifts, solver="dinic", days=30,
+                 shift_requirements=None, officer_bounds=None, weights=None, fairness=0):
+        """
+        Builds and solves the network for the given inputs
+
+        Input:
+            preferences, officers_per_org, min_shifts, max_shifts, days, shift_requirements, officer_bounds, weights,
+                fairness: As for allocate()
+            solver: The max flow algorithm used for every re-solve, one of allocation_system.SOLVERS. With "mincost"
+                    every re-solve starts from the previous flow and node potentials, so it only cancels the negative
+                    cycles a change created
+
+        Time complexity:
+            Best case analysis: O(N * M) to build the network, plus the cost of the solver
+            Worst case analysis: O(N * M) to build the network, plus the cost of the solver
+        """
+        if solver not in SOLVERS:
+            raise ValueError("Unknown solver: " + str(solver))
+        if (weights is not None or fairness) and solver != "mincost":
+            raise ValueError("weights and fairness need the mincost solver")
+        self.preferences = [list(officer) for officer in preferences]
+        self.officers_per_org = [list(company) for company in officers_per_org]
+        self.min_shifts = min_shifts
+        self.max_shifts = max_shifts
+        self.solver = solver
+        self.days = days
+        self.shifts = shift_count(preferences, officers_per_org)
+        check_overrides(len(preferences), len(officers_per_org), days, self.shifts, shift_requirements, officer_bounds)
+        self.shift_requirements = dict(shift_requirements or {})
+        self.officer_bounds = dict(officer_bounds or {})
+        self.network = CompactFlowNetwork(self.preferences, self.officers_per_org, min_shifts, max_shifts, complete=True,
+                                          days=days, shifts=self.shifts, shift_requirements=self.shift_requirements,
+                                          officer_bounds=self.officer_bounds, weights=weights, fairness=fairness)
+        self.cancelled_flow = 0
+        self.augmented_flow = self.solve()
+
+    def solve(self):
+        """
+        Runs the solver from the current flow
+
+        Return:
+            The amount of flow augmented
+        """
+        return getattr(self.network, SOLVERS[self.solver])()
+
+    def set_preferences(self, officer, preferences):
+        """
+        Changes the preferences of an officer and repairs the flow
+
+        Time complexity:
+            Best case analysis: O(M) where M is the number of companies, when the flow is unchanged
+            Worst case analysis: O(M * (V + E)) plus the cost of the solver, when every shift of the officer is dropped
+        """
+        fn = self.network
+        self.preferences[officer] = list(preferences)
+        for day in range(self.days):
+            for company in range(fn.company_count):
+                for shift in range(self.shifts):
+                    self.cancelled_flow += fn.set_capacity(fn.assignment_edge(officer, day, company, shift), preferences[shift])
+        return self.repair()
+
+    def set_requirement(self, company, shift, req, day=None):
+        """
+        Changes the number of officers a company requires for a shift and repairs the flow
+        Without a day the requirement of officers_per_org is changed, which applies to every day without a
+        requirement of its own. With a day only that day is changed
+
+        Time complexity:
+            Best case analysis: O(1) plus the cost of the solver
+            Worst case analysis: O(X * (V + E)) plus the cost of the solver, where X is the flow cancelled
+        """
+        fn = self.network
+        if day is None:
+            self.officers_per_org[company][shift] = req
+            days = range(self.days)
+        else:
+            check_overrides(fn.officer_count, fn.company_count, self.days, self.shifts, {(company, day, shift): req})
+            self.shift_requirements[company, day, shift] = req
+            days = (day,)
+        for day in days:
+            self.cancelled_flow += fn.set_capacity(fn.sink_edge(company, day, shift),
+                                                   requirement(self.officers_per_org, self.shift_requirements, company,
+                                                               day, shift))
+        self.update_source()
+        return self.repair()
+
+    def set_officers_per_org(self, company, requirements):
+        """
+        Changes every shift requirement of a company and repairs the flow once for all of them
+        Days with a requirement of their own in shift_requirements keep it
+
+        Time complexity:
+            Best case analysis: O(D * S) where D is the number of days and S is the number of shifts, plus the cost of
+                                the solver
+            Worst case analysis: O(X * (V + E)) plus the cost of the solver, where X is the flow cancelled
+        """
+        if len(requirements) != self.shifts:
+            raise ValueError("Expected " + str(self.shifts) + " shift requirements, got " + str(len(requirements)))
+        fn = self.network
+        self.officers_per_org[company] = list(requirements)
+        for day in range(self.days):
+            for shift in range(self.shifts):
+                self.cancelled_flow += fn.set_capacity(fn.sink_edge(company, day, shift),
+                                                       requirement(self.officers_per_org, self.shift_requirements,
+                                                                   company, day, shift))
+        self.update_source()
+        return self.repair()
+
+    def set_shift_bounds(self, min_shifts, max_shifts):
+        """
+        Changes the minimum and maximum number of shifts of every officer without bounds of their own and repairs the flow
+
+        Time complexity:
+            Best case analysis: O(N) where N is the number of officers, when the flow is unchanged
+            Worst case analysis: O(X * (V + E)) plus the cost of the solver, where X is the flow cancelled
+        """
+        fn = self.network
+        self.min_shifts = min_shifts
+        self.max_shifts = max_shifts
+        for i in range(fn.officer_count):
+            if i not in self.officer_bounds:
+                self.cancelled_flow += fn.set_capacity(i, abs(min_shifts))
+                self.cancelled_flow += fn.set_capacity(fn.source_edges + i, max_shifts - min_shifts)
+        self.update_source()
+        return self.repair()
+
+    def set_officer_bounds(self, officer, min_shifts, max_shifts):
+        """
+        Changes the minimum and maximum number of shifts of one officer and repairs the flow
+
+        Time complexity:
+            Best case analysis: O(B) where B is the number of officer bounds, when the flow is unchanged
+            Worst case analysis: O(X * (V + E)) plus the cost of the solver, where X is the flow cancelled
+        """
+        fn = self.network
+        check_overrides(fn.officer_count, fn.company_count, self.days, self.shifts, None, {officer: None})
+        self.officer_bounds[officer] = (min_shifts, max_shifts)
+        self.cancelled_flow += fn.set_capacity(officer, abs(min_shifts))
+        self.cancelled_flow += fn.set_capacity(fn.source_edges + officer, max_shifts - min_shifts)
+        self.update_source()
+        return self.repair()
+
+    def update_source(self):
+        """
+        Sets the capacity of the edge into the source node to the total requirement plus the minimum shifts of every officer
+
+        Time complexity:
+            Best case analysis: O(M + K + B) where M is the number of companies, K the number of shift requirements
+                                and B the number of officer bounds
+            Worst case analysis: O(X * (V + E)) where X is the flow cancelled
+        """
+        fn = self.network
+        total_req = total_requirement(self.officers_per_org, self.shift_requirements, self.days)
+        self.cancelled_flow += fn.set_capacity(fn.officer_count, abs(total_req + total_minimum(
+            fn.officer_count, self.min_shifts, self.officer_bounds)))
+
+    def repair(self):
+        """
+        Augments the flow lost to cancellations and capacity increases
+
+        Return:
+            True if every shift requirement is met after the repair, False otherwise
+        """
+        self.augmented_flow += self.solve()
+        return self.network.requirements_met()
+
+    def allocation(self, output="nested"):
+        """
+        Returns the current allocation in the given output format of allocate(), or None if the roster is not feasible
+        """
+        if not self.network.requirements_met():
+            return None
+        return build_output(self.network.assignments(), len(self.preferences), len(self.officers_per_org), output,
+                            self.days, self.shifts)
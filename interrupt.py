@@ -0,0 +1,48 @@
+import time
+
+class SolveInterrupted(Exception):
+    """
+    Raised by a solver when the should_stop function of its network returns True
+    The flow of the network is left as it was when the solver stopped
+    """
+    def __init__(self, reason="cancelled"):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class StopCheck:
+    """
+    A should_stop function for allocate() that stops at a deadline or once an event is set
+    The deadline is a time.time() value, so the check can be sent to another process. Reading the event can be slow
+    (for example a multiprocessing Manager event), so it is only read once every interval seconds
+
+    Attributes:
+        reason: "timed_out" or "cancelled" once the check has returned True, None before
+    """
+    def __init__(self, deadline=None, event=None, interval=0.05):
+        """
+        Input:
+            deadline: The time.time() after which the solve stops, None for no deadline
+            event: An object with an is_set() method, the solve stops once it is set. None for no event
+            interval: The least number of seconds between two reads of the event
+        """
+        self.deadline = deadline
+        self.event = event
+        self.interval = interval
+        self.next_poll = 0
+        self.reason = None
+
+    def __call__(self):
+        """
+        Returns True if the solve should stop
+        """
+        now = time.time()
+        if self.deadline is not None and now >= self.deadline:
+            self.reason = "timed_out"
+            return True
+        if self.event is not None and now >= self.next_poll:
+            self.next_poll = now + self.interval
+            if self.event.is_set():
+                self.reason = "cancelled"
+                return True
+        return False
@@ -1,7 +1,10 @@
 class Node:
     """
     Node class for the flow network
+    Nodes use __slots__ instead of a per instance __dict__, as large networks hold millions of them
     """
+    __slots__ = ("demand", "edges")
+
     def __init__(self):
         self.demand = 0
         self.edges = []
@@ -14,12 +17,14 @@ class RN_Node:
     """
     Node class for the residual network
     Additional attributes:
-        visited: A boolean attribute to store if the node has been visited
+        visited: The search epoch in which the node was last visited, see FlowNetwork.PathAugmentation
         corresponding_node: The corresponding node in the flow network
         edge_taken: The edge taken to reach the node
     """
+    __slots__ = ("visited", "edges", "corresponding_node", "edge_taken")
+
     def __init__(self, node):
-        self.visited = False
+        self.visited = 0
         self.edges = []
         self.corresponding_node = node
         self.edge_taken = None
@@ -32,6 +37,8 @@ class ShiftNode(Node):
     """
     Shift node class for the flow network
     """
+    __slots__ = ("company", "day", "shift", "req")
+
     def __init__(self, company, day, shift, req):
         super().__init__()
         self.company = company
@@ -43,18 +50,22 @@ class ShiftNode(Node):
 class OfficerNode(Node):
     """
     Officer node class for the flow network
+    The officer's preferences are read from the input when the network is built rather than stored on the node
     """
-    def __init__(self, officer, preferences):
+    __slots__ = ("officer",)
+
+    def __init__(self, officer):
         super().__init__()
         self.officer = officer
-        self.preferences = preferences
 
 
 class AllocationNode(Node):
     """
     Allocation node class for the flow network
     """
+    __slots__ = ("officer", "day")
+
     def __init__(self, officer, day):
         super().__init__()
         self.officer = officer
-        self.day = day
\ No newline at end of file
+        self.day = day
@@ -0,0 +1,168 @@
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+class CoreProblem:
+    """
+    The part of an allocation problem left for the solver once prune_problem has taken out what cannot change the
+    answer, with the maps back to the full problem
+
+    Attributes:
+        preferences, officers_per_org, days, shift_requirements, officer_bounds, unavailable: The inputs of allocate()
+            for the core, in core indices
+        officers, companies, day_index, shift_index: The full index of every core officer, company, day and shift
+        forced: The (officer, company, day, shift) assignments fixed before solving, in full indices
+    """
+    def __init__(self, preferences, officers_per_org, days, shift_requirements, officer_bounds, unavailable, officers,
+                 companies, day_index, shift_index, forced):
+        self.preferences = preferences
+        self.officers_per_org = officers_per_org
+        self.days = days
+        self.shift_requirements = shift_requirements
+        self.officer_bounds = officer_bounds
+        self.unavailable = unavailable
+        self.officers = officers
+        self.companies = companies
+        self.day_index = day_index
+        self.shift_index = shift_index
+        self.forced = forced
+
+    def expand(self, assignments):
+        """
+        Yields the (officer, company, day, shift) assignments of the core in full indices
+
+        Time complexity:
+            Best case analysis: O(A) where A is the number of assignments
+            Worst case analysis: O(A) where A is the number of assignments
+        """
+        officers, companies, day_index, shift_index = self.officers, self.companies, self.day_index, self.shift_index
+        for officer, company, day, shift in assignments:
+            yield officers[officer], companies[company], day_index[day], shift_index[shift]
+
+    def expand_cut(self, cut):
+        """
+        Rewrites the min cut report of a core solve (see FlowNetwork.min_cut) in full indices, in place
+        """
+        cut["unmet_shifts"] = [(None if company is None else self.companies[company], self.day_index[day],
+                                self.shift_index[shift], req, assigned)
+                               for company, day, shift, req, assigned in cut["unmet_shifts"]]
+        cut["saturated_officers"] = [self.officers[officer] for officer in cut["saturated_officers"]]
+        cut["saturated_days"] = [(self.officers[officer], self.day_index[day]) for officer, day in cut["saturated_days"]]
+
+    def core_weights(self, weights):
+        """
+        Returns the rows and columns of weights that belong to the core officers and shifts (None if weights is None)
+        """
+        if weights is None:
+            return None
+        return [[weights[officer][shift] for shift in self.shift_index] for officer in self.officers]
+
+    def summary(self):
+        """
+        Returns the size of the core and the number of forced assignments, for the report of allocate()
+        """
+        return {"officers": len(self.officers), "companies": len(self.companies), "days": self.days,
+                "shifts": len(self.shift_index), "forced": len(self.forced)}
+
+
+def prune_problem(preferences, officers_per_org, min_shifts, max_shifts, days=30, shifts=3, shift_requirements=None,
+                  officer_bounds=None, unavailable=None, force=True):
+    """
+    Reduces an allocation problem to the core the solver has to see, with NumPy array operations over the officers,
+    days and shifts instead of the network
+        Forced assignments: when the demand of a shift on a day, summed over the companies, equals the number of
+            officers who prefer it, are free that day and have shifts left, every one of them must work it in any
+            valid allocation. As preferences do not depend on the company, they are handed to the companies in order.
+            Their day is closed and their bounds lowered, which can make further shifts forced, so this is repeated
+            until nothing changes. It stops early if the forced shifts conflict (two on one day, or more than an
+            officer's maximum), leaving the infeasible problem for the solver to report
+        Dead companies, days and shifts: the ones without any demand left
+        Dead officers: the ones who prefer none of the remaining shifts, have no shifts left or no free remaining day
+
+    Precondition: NumPy is installed
+    Postcondition: The core has a valid allocation if and only if the full problem has one, and the forced assignments
+                   together with the expanded allocation of the core are a valid allocation of the full problem
+
+    Input:
+        preferences, officers_per_org, min_shifts, max_shifts, days, shifts, shift_requirements, officer_bounds,
+            unavailable: As for allocate()
+        force: If False, only remove dead nodes. Forcing changes how many shifts above their minimum the officers work
+               in the core, so it is turned off for the fairness costs of the mincost solver
+    Return:
+        A CoreProblem
+
+    Time complexity:
+        Best case analysis: O(N * D * S + M * D * S) where N is the number of officers, M is the number of companies,
+                            D is the number of days and S is the number of shifts
+        Worst case analysis: O(D * S * (N * D * S + M * D * S)) when every round forces a single shift
+    Space complexity:
+        Input space analysis: O(N + M + K + B + U) where K, B and U are the number of shift requirements, officer bounds
+                              and unavailable days
+        Aux space analysis: O(N * D * S + M * D * S)
+    """
+    if np is None:
+        raise ImportError("Pruning requires NumPy")
+    officer_count, company_count = len(preferences), len(officers_per_org)
+    prefers = np.array(preferences, dtype=bool).reshape(officer_count, shifts)
+    base = np.array(officers_per_org, dtype=np.int64).reshape(company_count, shifts)
+    demand = np.repeat(base[:, None, :], days, axis=1)
+    for (company, day, shift), req in (shift_requirements or {}).items():
+        demand[company, day, shift] = req
+    low = np.full(officer_count, min_shifts, dtype=np.int64)
+    high = np.full(officer_count, max_shifts, dtype=np.int64)
+    for officer, (officer_min, officer_max) in (officer_bounds or {}).items():
+        low[officer] = officer_min
+        high[officer] = officer_max
+    free = np.ones((officer_count, days), dtype=bool)
+    for officer, day in unavailable or ():
+        free[officer, day] = False
+
+    forced = []
+    while force:
+        able = prefers & (high > 0)[:, None]
+        # eligible[day, shift] is the number of officers who could still work the shift on that day
+        eligible = free.T.astype(np.int64) @ able.astype(np.int64)
+        need = demand.sum(axis=0)
+        tight = (need > 0) & (need == eligible)
+        if not tight.any():
+            break
+        hits = free[:, :, None] & able[:, None, :] & tight[None, :, :]
+        per_day = hits.sum(axis=2)
+        per_officer = per_day.sum(axis=1)
+        if (per_day > 1).any() or (per_officer > high).any():
+            break
+        # Group the forced officers by (day, shift) in the order of the tight cells, then deal every cell out to the
+        # companies in order, each taking its demand
+        officer, day, shift = np.nonzero(hits)
+        order = np.lexsort((officer, shift, day))
+        officer, day, shift = officer[order], day[order], shift[order]
+        cell_day, cell_shift = np.nonzero(tight)
+        counts = demand[:, cell_day, cell_shift].T
+        company = np.repeat(np.tile(np.arange(company_count), len(cell_day)), counts.ravel())
+        forced.extend(zip(officer.tolist(), company.tolist(), day.tolist(), shift.tolist()))
+        demand[:, cell_day, cell_shift] = 0
+        free[officer, day] = False
+        high -= per_officer
+        low = np.maximum(low - per_officer, 0)
+
+    live = demand > 0
+    companies = np.flatnonzero(live.any(axis=(1, 2)))
+    day_index = np.flatnonzero(live.any(axis=(0, 2)))
+    shift_index = np.flatnonzero(live.any(axis=(0, 1)))
+    working = prefers[:, shift_index].any(axis=1) & (high > 0) & free[:, day_index].any(axis=1)
+    officers = np.flatnonzero(working)
+
+    core_base = base[np.ix_(companies, shift_index)]
+    core_demand = demand[np.ix_(companies, day_index, shift_index)]
+    company, day, shift = np.nonzero(core_demand != core_base[:, None, :])
+    core_requirements = {(c, d, s): int(core_demand[c, d, s])
+                         for c, d, s in zip(company.tolist(), day.tolist(), shift.tolist())}
+    changed = np.flatnonzero((low[officers] != min_shifts) | (high[officers] != max_shifts))
+    core_bounds = {int(officer): (int(low[officers[officer]]), int(high[officers[officer]])) for officer in changed}
+    officer, day = np.nonzero(~free[np.ix_(officers, day_index)])
+    core_unavailable = list(zip(officer.tolist(), day.tolist()))
+
+    return CoreProblem(prefers[np.ix_(officers, shift_index)].astype(np.int64).tolist(), core_base.tolist(),
+                       len(day_index), core_requirements or None, core_bounds or None, core_unavailable or None,
+                       officers.tolist(), companies.tolist(), day_index.tolist(), shift_index.tolist(), forced)
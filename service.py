@@ -0,0 +1,364 @@
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from allocation_system import allocate
+from batch import INPUT_KEYS, OPTIONAL_KEYS, decode_overrides
+from interrupt import SolveInterrupted, StopCheck
+from solution_store import solution_key
+
+def run_solve(arguments, options, check):
+    """
+    Runs one solve of the service in an executor
+
+    Input:
+        arguments: The positional arguments of allocate()
+        options: The keyword arguments of allocate()
+        check: The StopCheck of the solve, set once nobody waits for the result any more
+    Return:
+        A dictionary with "status": "ok" (with "allocation"), "partial" (with "allocation" and "shortfall"),
+        "infeasible" or the reason the solve was stopped
+    """
+    # The solve may have been abandoned while it was queued
+    if check():
+        return {"status": check.reason}
+    try:
+        allocation = allocate(*arguments, should_stop=check, **options)
+    except SolveInterrupted as interrupted:
+        return {"status": interrupted.reason}
+    if options.get("partial"):
+        allocation, missing = allocation
+        return {"status": "partial" if missing["unmet_shifts"] else "ok", "allocation": allocation,
+                "shortfall": missing}
+    if allocation is None:
+        return {"status": "infeasible"}
+    return {"status": "ok", "allocation": allocation}
+
+
+class Flight:
+    """
+    A solve in progress, shared by every request with the same inputs
+
+    Attributes:
+        future: The asyncio future of the result of run_solve
+        event: Set to stop the solve once its waiters are gone
+        waiters: The number of requests waiting for the result
+    """
+    def __init__(self, future, event):
+        self.future = future
+        self.event = event
+        self.waiters = 0
+
+
+class AllocationService:
+    """
+    Runs allocate() for asyncio code without blocking the event loop
+    Solves run in an executor. Requests with the same inputs while a solve is in flight wait for that solve instead of
+    starting another one. Every request has its own timeout, after which it gets {"status": "timed_out"}; once every
+    request waiting for a solve has timed out or been cancelled, the solve is stopped between two augmentations (see
+    allocate's should_stop), so an abandoned solve does not hold a worker until it finishes
+
+    A request with partial=True is answered with the best allocation found by its timeout instead: its solve is given
+    the timeout as a deadline and returns {"status": "partial", "allocation", "shortfall"} (see allocate's partial)
+    when the requirements are not all met by then. Only partial requests with the same timeout share a solve
+
+    Threads share the GIL with the event loop, so a long solve slows it down without blocking it. With processes=True
+    solves run in a process pool and are stopped through a multiprocessing Manager event, read at most every 50ms
+
+    Example:
+        async with AllocationService(workers=4) as service:
+            result = await service.solve(preferences, officers_per_org, min_shifts, max_shifts, timeout=5)
+            if result["status"] == "ok":
+                allocation = result["allocation"]
+    """
+    def __init__(self, workers=None, processes=False, options=None):
+        """
+        Input:
+            workers: The number of solves run at once, defaults to the number of CPUs
+            processes: If True, run solves in a process pool instead of a thread pool
+            options: Keyword arguments passed to allocate() for every request, such as solver. They must be JSON
+                     encodable, as they are part of the key that decides which requests share a solve
+        """
+        self.options = options or {}
+        self.workers = workers or os.cpu_count() or 1
+        self.processes = processes
+        if processes:
+            self.manager = multiprocessing.Manager()
+            self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        else:
+            self.manager = None
+            self.executor = ThreadPoolExecutor(max_workers=self.workers)
+        self.flights = {}
+        self.started = 0
+        self.coalesced = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def solve(self, preferences, officers_per_org, min_shifts, max_shifts, timeout=None, **options):
+        """
+        Allocates shifts in the executor, sharing the solve of an identical request already in flight
+
+        Input:
+            preferences, officers_per_org, min_shifts, max_shifts: As for allocate()
+            timeout: The most seconds to wait for the result, None to wait until it is found
+            options: Keyword arguments of allocate() for this request, added to the options of the service
+        Return:
+            A dictionary with "status":
+                "ok": "allocation" holds the result of allocate()
+                "partial": with partial=True, "allocation" covers part of the demand and "shortfall" reports the rest
+                "infeasible": allocate() returned None
+                "timed_out": the timeout passed first
+                "cancelled": the service was closed before the solve finished
+        Raises:
+            Any error allocate() raises for invalid inputs, and asyncio.CancelledError if the request is cancelled
+
+        Time complexity:
+            Best case analysis: O(N + M) for hashing the inputs when an identical solve is in flight
+            Worst case analysis: The time of allocate()
+        """
+        options = dict(self.options, **options)
+        deadline = None
+        if options.get("partial"):
+            # The solve itself stops at the timeout with the best allocation found, so the request waits for it
+            key = solution_key(preferences, officers_per_org, min_shifts, max_shifts, timeout=timeout, **options)
+            if timeout is not None:
+                deadline = time.time() + timeout
+            timeout = None
+        else:
+            key = solution_key(preferences, officers_per_org, min_shifts, max_shifts, **options)
+        flight = self.flights.get(key)
+        if flight is None:
+            flight = self.start(key, (preferences, officers_per_org, min_shifts, max_shifts), options, deadline)
+        else:
+            self.coalesced += 1
+        flight.waiters += 1
+        try:
+            return await asyncio.wait_for(asyncio.shield(flight.future), timeout)
+        except asyncio.TimeoutError:
+            return {"status": "timed_out"}
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.future.done():
+                # Nobody waits for the result any more, stop the solve and let a later request start a new one
+                flight.event.set()
+                if self.flights.get(key) is flight:
+                    del self.flights[key]
+
+    def start(self, key, arguments, options, deadline=None):
+        """
+        Submits a new solve to the executor and registers it as in flight under key, stopping it at the time.time()
+        deadline if one is given
+        """
+        event = self.manager.Event() if self.processes else threading.Event()
+        check = StopCheck(deadline, event, 0.05 if self.processes else 0)
+        future = asyncio.get_running_loop().run_in_executor(self.executor, run_solve, arguments, options, check)
+        flight = Flight(future, event)
+        self.flights[key] = flight
+        self.started += 1
+
+        def finished(future):
+            if self.flights.get(key) is flight:
+                del self.flights[key]
+            # Mark the error of an abandoned solve as retrieved
+            if not future.cancelled():
+                future.exception()
+
+        future.add_done_callback(finished)
+        return flight
+
+    def close(self):
+        """
+        Stops every solve in flight and shuts the executor down, blocking until the solves have returned
+        From a coroutine use aclose, which does not block the event loop
+        """
+        self.stop_flights()
+        self.shutdown()
+
+    async def aclose(self):
+        """
+        Stops every solve in flight and waits in another thread for the executor to shut down, as a solve still
+        building its network only sees its stop event once it starts augmenting
+        """
+        self.stop_flights()
+        await asyncio.get_running_loop().run_in_executor(None, self.shutdown)
+
+    def stop_flights(self):
+        """
+        Sets the stop event of every solve in flight and forgets them
+        """
+        for flight in self.flights.values():
+            flight.event.set()
+        self.flights.clear()
+
+    def shutdown(self):
+        """
+        Shuts the executor and the manager down, waiting for the running solves to return
+        """
+        self.executor.shutdown(wait=True)
+        if self.manager is not None:
+            self.manager.shutdown()
+
+    async def handle_client(self, reader, writer):
+        """
+        Serves one connection of the JSONL protocol of serve()
+        Requests of a connection are solved concurrently, so results are written as they complete with the "index" of
+        their line. When the client closes the connection, its requests still in flight are cancelled
+        """
+        lock = asyncio.Lock()
+        tasks = set()
+        index = 0
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                task = asyncio.ensure_future(self.answer(index, line, writer, lock))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+                index += 1
+        except ConnectionError:
+            pass
+        finally:
+            for task in list(tasks):
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            writer.close()
+
+    async def answer(self, index, line, writer, lock):
+        """
+        Solves one request line and writes its result
+
+        Input:
+            index: The position of the line in the connection, counting non-blank lines from 0
+            line: A JSON object with the inputs of allocate(), optionally the OPTIONAL_KEYS of batch.py, a "timeout" in
+                  seconds and an "id"
+        """
+        result = {"index": index}
+        try:
+            request = json.loads(line)
+            if "id" in request:
+                result["id"] = request["id"]
+            arguments = [request[key] for key in INPUT_KEYS]
+            decode_overrides(request)
+            options = {key: request[key] for key in OPTIONAL_KEYS if key in request}
+            result.update(await self.solve(*arguments, timeout=request.get("timeout"), **options))
+        except Exception as error:
+            result["status"] = "error"
+            result["error"] = type(error).__name__ + ": " + str(error)
+        async with lock:
+            writer.write((json.dumps(result, separators=(",", ":")) + "\n").encode())
+            await writer.drain()
+
+
+async def serve(service, host="127.0.0.1", port=0):
+    """
+    Starts a stand-in server for the service: every line a client sends is a JSON request (see
+    AllocationService.answer), answered by one JSON result line {"index", "id", "status", "allocation" or "error"}
+
+    Input:
+        service: The AllocationService that solves the requests
+        host: The address to listen on
+        port: The port to listen on, 0 for any free port (read it from server.sockets[0].getsockname())
+    Return:
+        The asyncio server, already accepting connections
+    """
+    return await asyncio.start_server(service.handle_client, host, port, limit=2 ** 26)
+
+
+async def load_test(host, port, lines, connections=4):
+    """
+    Sends request lines to a server over several connections at once and measures the time to each result
+
+    Input:
+        host, port: The address of the server
+        lines: The JSONL request lines, dealt round robin over the connections
+        connections: The number of connections opened at once
+    Return:
+        A dictionary with the number of requests, the total seconds, the count of every status and the 50th, 95th and
+        100th percentile of the latency in seconds
+    """
+    lines = [line.strip() for line in lines if line.strip()]
+    latencies = []
+    statuses = {}
+
+    async def client(batch):
+        reader, writer = await asyncio.open_connection(host, port, limit=2 ** 26)
+        sent = []
+        for line in batch:
+            sent.append(time.perf_counter())
+            writer.write(line.encode() + b"\n")
+        await writer.drain()
+        for _ in batch:
+            result = json.loads(await reader.readline())
+            latencies.append(time.perf_counter() - sent[result["index"]])
+            statuses[result["status"]] = statuses.get(result["status"], 0) + 1
+        writer.close()
+        await writer.wait_closed()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(lines[i::connections]) for i in range(connections) if lines[i::connections]))
+    total = time.perf_counter() - start
+    latencies.sort()
+
+    def percentile(fraction):
+        return latencies[min(len(latencies) - 1, int(fraction * len(latencies)))] if latencies else 0
+
+    return {"requests": len(lines), "seconds": total, "statuses": statuses, "p50": percentile(0.5),
+            "p95": percentile(0.95), "max": percentile(1)}
+
+
+def main(argv=None):
+    """
+    Command line entry point, see python service.py --help
+    """
+    parser = argparse.ArgumentParser(description="Serve allocation requests over a JSONL socket protocol")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on or to connect to")
+    parser.add_argument("--port", type=int, default=None,
+                        help="port to listen on (serve) or of the server to load (load, in process server if omitted)")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="number of solves run at once")
+    parser.add_argument("--processes", action="store_true", help="run solves in a process pool")
+    parser.add_argument("--solver", default="fordfulkerson", help="max flow solver passed to allocate()")
+    parser.add_argument("--load", default=None, help="JSONL file of requests to send as a load test, - for stdin")
+    parser.add_argument("--connections", type=int, default=4, help="connections opened by the load test")
+    args = parser.parse_args(argv)
+
+    lines = None
+    if args.load is not None:
+        if args.load == "-":
+            lines = sys.stdin.readlines()
+        else:
+            with open(args.load) as file:
+                lines = file.readlines()
+
+    async def run():
+        if lines is not None and args.port is not None:
+            print(json.dumps(await load_test(args.host, args.port, lines, args.connections)))
+            return
+        async with AllocationService(args.workers, args.processes, {"solver": args.solver}) as service:
+            server = await serve(service, args.host, args.port or 0)
+            async with server:
+                if lines is None:
+                    print("Listening on", server.sockets[0].getsockname(), file=sys.stderr)
+                    await server.serve_forever()
+                port = server.sockets[0].getsockname()[1]
+                summary = await load_test(args.host, port, lines, args.connections)
+                summary["started"] = service.started
+                summary["coalesced"] = service.coalesced
+                print(json.dumps(summary))
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
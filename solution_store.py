@@ -0,0 +1,219 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+import tempfile
+from array import array
+from collections import OrderedDict
+
+# Header of a stored solution: magic, version, feasible, index width in bytes, officers, companies, days, shifts and
+# the number of assignments, followed by the assignment indices in native byte order (see SolutionStore.pack)
+HEADER = struct.Struct("=4sBBBxIIIIQ")
+MAGIC = b"ALOC"
+VERSION = 1
+
+def as_row(value):
+    """
+    Returns a key or value of an override dictionary as a list, so that its entries can be sorted and written as JSON
+    """
+    return list(value) if isinstance(value, tuple) else [value]
+
+
+def solution_key(preferences, officers_per_org, min_shifts, max_shifts, **options):
+    """
+    Returns the hex SHA-256 of the inputs of a solve
+    Dictionaries keyed by tuples (shift_requirements, officer_bounds) and sets (unavailable) are written as sorted lists,
+    so the key does not depend on the order they were filled in, and NumPy integers are written as plain integers
+
+    Input:
+        preferences, officers_per_org, min_shifts, max_shifts: As for allocate()
+        options: Every other argument of allocate() that changes which allocation is returned
+    Return:
+        A 64 character hex string
+
+    Time complexity:
+        Best case analysis: O(N + M + K + B) where N is the number of officers, M is the number of companies, K is the
+                            number of shift requirements and B is the number of officer bounds
+        Worst case analysis: O((N + M + K + B) * log(K + B)) for sorting the overrides
+    """
+    canonical = [preferences, officers_per_org, min_shifts, max_shifts]
+    for name in sorted(options):
+        value = options[name]
+        if isinstance(value, dict):
+            value = sorted(as_row(key) + as_row(item) for key, item in value.items())
+        elif isinstance(value, (set, frozenset)):
+            value = sorted(as_row(item) for item in value)
+        canonical.append([name, value])
+    text = json.dumps(canonical, separators=(",", ":"), default=int)
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+class SolutionStore:
+    """
+    Content addressed store of solved allocations
+    Solutions are keyed by a SHA-256 of the canonical JSON of every input that decides the allocation, see solution_key.
+    The in-memory tier keeps the sparse assignments of the most recently used solutions, the optional on-disk tier keeps
+    every solution in a small binary file: each assignment (officer, company, day, shift) is packed into a single
+    integer index of 4 bytes (8 for very large rosters), read back through mmap without parsing any text
+
+    Example:
+        store = SolutionStore("allocations", max_entries=256)
+        allocate(preferences, officers_per_org, min_shifts, max_shifts, store=store)
+        allocate(preferences, officers_per_org, min_shifts, max_shifts, store=store)  # served from memory
+    """
+    def __init__(self, directory=None, max_entries=128, max_assignments=None):
+        """
+        Input:
+            directory: The directory of the on-disk tier, created if missing (memory only if None)
+            max_entries: The most solutions kept in memory
+            max_assignments: The most assignments kept in memory over every solution (no limit if None)
+        """
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_assignments = max_assignments
+        self.solutions = OrderedDict()
+        self.assignments = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def key(self, preferences, officers_per_org, min_shifts, max_shifts, **options):
+        """
+        Returns the key of the inputs of a solve, see solution_key
+        """
+        return solution_key(preferences, officers_per_org, min_shifts, max_shifts, **options)
+
+    def get(self, key):
+        """
+        Looks up a solution, first in memory then on disk (a disk hit is kept in memory afterwards)
+
+        Return:
+            None if the key is unknown, otherwise ((officers, companies, days, shifts), assignments) where assignments
+            is a tuple of (officer, company, day, shift) tuples, or None if the inputs have no allocation
+
+        Time complexity:
+            Best case analysis: O(1) for a memory hit
+            Worst case analysis: O(A) for a disk hit where A is the number of assignments
+        """
+        entry = self.solutions.get(key)
+        if entry is not None:
+            self.memory_hits += 1
+            self.solutions.move_to_end(key)
+            return entry
+        entry = self.read(key) if self.directory is not None else None
+        if entry is None:
+            self.misses += 1
+            return None
+        self.disk_hits += 1
+        self.remember(key, entry)
+        return entry
+
+    def put(self, key, shape, assignments):
+        """
+        Stores a solution in memory and, if the store has a directory, on disk
+
+        Input:
+            key: The key() of the inputs
+            shape: (officers, companies, days, shifts)
+            assignments: An iterable of (officer, company, day, shift) tuples, or None if the inputs have no allocation
+        """
+        if assignments is not None:
+            assignments = tuple(assignments)
+        entry = (tuple(shape), assignments)
+        self.remember(key, entry)
+        if self.directory is not None:
+            self.write(key, entry)
+
+    def remember(self, key, entry):
+        """
+        Adds a solution to the in-memory tier, dropping the least recently used ones until it is within its limits
+        """
+        if key in self.solutions:
+            self.assignments -= len(self.solutions[key][1] or ())
+        self.solutions[key] = entry
+        self.solutions.move_to_end(key)
+        self.assignments += len(entry[1] or ())
+        while len(self.solutions) > 1 and (len(self.solutions) > self.max_entries or
+                                           (self.max_assignments is not None and self.assignments > self.max_assignments)):
+            _, (_, assignments) = self.solutions.popitem(last=False)
+            self.assignments -= len(assignments or ())
+
+    def path(self, key):
+        """
+        Returns the file of a solution in the on-disk tier
+        """
+        return os.path.join(self.directory, key + ".alloc")
+
+    def pack(self, entry):
+        """
+        Encodes a solution: the header, then ((officer * M + company) * D + day) * S + shift for every assignment
+
+        Time complexity:
+            Best case analysis: O(A) where A is the number of assignments
+            Worst case analysis: O(A) where A is the number of assignments
+        """
+        (officers, companies, days, shifts), assignments = entry
+        width = 4 if officers * companies * days * shifts < 2 ** 32 else 8
+        indices = array('I' if width == 4 else 'Q')
+        for officer, company, day, shift in assignments or ():
+            indices.append(((officer * companies + company) * days + day) * shifts + shift)
+        header = HEADER.pack(MAGIC, VERSION, assignments is not None, width, officers, companies, days, shifts,
+                             len(indices))
+        return header + indices.tobytes()
+
+    def write(self, key, entry):
+        """
+        Writes a solution to the on-disk tier through a temporary file, so readers never see a partial file
+        """
+        handle, temporary = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(handle, "wb") as file:
+                file.write(self.pack(entry))
+            os.replace(temporary, self.path(key))
+        except BaseException:
+            os.unlink(temporary)
+            raise
+
+    def read(self, key):
+        """
+        Reads a solution from the on-disk tier through mmap
+
+        Return:
+            The entry of get(), or None if there is no valid file for the key
+
+        Time complexity:
+            Best case analysis: O(1) when there is no file
+            Worst case analysis: O(A) where A is the number of assignments
+        """
+        try:
+            file = open(self.path(key), "rb")
+        except FileNotFoundError:
+            return None
+        with file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            if len(mapped) < HEADER.size:
+                return None
+            magic, version, feasible, width, officers, companies, days, shifts, count = HEADER.unpack_from(mapped)
+            if magic != MAGIC or version != VERSION or len(mapped) != HEADER.size + width * count:
+                return None
+            shape = (officers, companies, days, shifts)
+            if not feasible:
+                return shape, None
+            view = memoryview(mapped)[HEADER.size:].cast('I' if width == 4 else 'Q')
+            assignments = []
+            for index in view:
+                rest, shift = divmod(index, shifts)
+                rest, day = divmod(rest, days)
+                officer, company = divmod(rest, companies)
+                assignments.append((officer, company, day, shift))
+            view.release()
+        return shape, tuple(assignments)
+
+    def clear(self):
+        """
+        Drops every solution from the in-memory tier (the on-disk tier is kept)
+        """
+        self.solutions.clear()
+        self.assignments = 0
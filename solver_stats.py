@@ -0,0 +1,90 @@
+class SolverStats:
+    """
+    Counters and timings collected while solving a network
+    A network only records into its stats attribute when it is set, so leaving it as None costs one check per search.
+    Attributes:
+        augmenting_paths: The number of augmenting paths pushed (Ford Fulkerson and Dinic)
+        total_path_length: The total number of edges over every augmenting path
+        searches: The number of BFS searches run (path searches, level graphs and min cut searches)
+        nodes_scanned: The total number of nodes taken off the BFS queue
+        edges_scanned: The total number of edges looked at by the BFS searches
+        pushes: The number of push operations (push-relabel)
+        relabels: The number of relabel operations (push-relabel)
+        timings: The seconds spent in each phase of allocate(): build, residual, seed, augment and output
+    """
+    def __init__(self):
+        self.augmenting_paths = 0
+        self.total_path_length = 0
+        self.searches = 0
+        self.nodes_scanned = 0
+        self.edges_scanned = 0
+        self.pushes = 0
+        self.relabels = 0
+        self.timings = {}
+
+    def record_path(self, length):
+        """
+        Records an augmenting path with the given number of edges
+        """
+        self.augmenting_paths += 1
+        self.total_path_length += length
+
+    def record_search(self, nodes, edges):
+        """
+        Records a BFS that took the given number of nodes off its queue and looked at the given number of edges
+        """
+        self.searches += 1
+        self.nodes_scanned += nodes
+        self.edges_scanned += edges
+
+    def add(self, stats):
+        """
+        Adds the counters and timings of another run, given as the dictionary of as_dict(), to these stats
+        """
+        for name in ("augmenting_paths", "total_path_length", "searches", "nodes_scanned", "edges_scanned", "pushes",
+                     "relabels"):
+            setattr(self, name, getattr(self, name) + stats[name])
+        for phase, seconds in stats["timings"].items():
+            self.timings[phase] = self.timings.get(phase, 0) + seconds
+
+    def average_path_length(self):
+        """
+        Returns the average number of edges per augmenting path (0 if no path was found)
+        """
+        if self.augmenting_paths == 0:
+            return 0
+        return self.total_path_length / self.augmenting_paths
+
+    def average_nodes_scanned(self):
+        """
+        Returns the average number of nodes taken off the queue per BFS (0 if no search was run)
+        """
+        if self.searches == 0:
+            return 0
+        return self.nodes_scanned / self.searches
+
+    def average_edges_scanned(self):
+        """
+        Returns the average number of edges looked at per BFS (0 if no search was run)
+        """
+        if self.searches == 0:
+            return 0
+        return self.edges_scanned / self.searches
+
+    def as_dict(self):
+        """
+        Returns the stats as a dictionary that can be encoded as JSON
+        """
+        return {
+            "augmenting_paths": self.augmenting_paths,
+            "total_path_length": self.total_path_length,
+            "average_path_length": self.average_path_length(),
+            "searches": self.searches,
+            "nodes_scanned": self.nodes_scanned,
+            "edges_scanned": self.edges_scanned,
+            "average_nodes_scanned": self.average_nodes_scanned(),
+            "average_edges_scanned": self.average_edges_scanned(),
+            "pushes": self.pushes,
+            "relabels": self.relabels,
+            "timings": dict(self.timings),
+        }
@@ -0,0 +1,95 @@
+from collections import OrderedDict
+from compact_network import CompactFlowNetwork
+
+class TopologyCache:
+    """
+    Keeps built CompactFlowNetworks between solves that share their structure
+    The nodes and edges of a network only depend on the preferences, the company count, the days, the shifts and
+    whether it is aggregated. Solves that only differ in requirements, shift bounds or costs take the built network
+    from the cache and reset its flows and capacities instead of building it again. The least recently used networks
+    are dropped once the cache holds more than max_entries networks or more than max_arcs arcs in total
+
+    A cached network is handed out as is, so a cache must only be used by one solve at a time
+
+    Example:
+        cache = TopologyCache(max_entries=4)
+        allocate(preferences, officers_per_org, min_shifts, max_shifts, cache=cache)
+        allocate(preferences, other_officers_per_org, min_shifts, max_shifts, cache=cache)  # reuses the network
+    """
+    def __init__(self, max_entries=8, max_arcs=None):
+        """
+        Input:
+            max_entries: The most networks kept at once
+            max_arcs: The most arcs kept at once over every network (no limit if None). Each arc of a compact network
+                      takes about 40 bytes, see Edge
+        """
+        self.max_entries = max_entries
+        self.max_arcs = max_arcs
+        self.networks = OrderedDict()
+        self.arcs = 0
+        self.hits = 0
+        self.misses = 0
+
+    def network(self, preferences, officers_per_org, min_shifts, max_shifts, days=30, shifts=3, aggregate=False,
+                **options):
+        """
+        Returns a network for the given inputs, reset from the cache if one with the same structure is kept, otherwise
+        built and added to the cache
+
+        Input:
+            preferences, officers_per_org, min_shifts, max_shifts, days, shifts, aggregate: As for CompactFlowNetwork
+            options: The other keyword arguments of CompactFlowNetwork.reset (shift_requirements, officer_bounds,
+                     weights and fairness)
+        Return:
+            A CompactFlowNetwork with no flow
+
+        Time complexity:
+            Best case analysis: O(N + M) where N is the number of officers and M is the number of companies, on a hit
+                                without costs
+            Worst case analysis: O(N * M) where N is the number of officers and M is the number of companies, on a miss
+        """
+        key = self.key(preferences, len(officers_per_org), days, shifts, aggregate)
+        fn = self.networks.get(key)
+        if fn is not None:
+            self.hits += 1
+            self.networks.move_to_end(key)
+            fn.reset(officers_per_org, min_shifts, max_shifts, **options)
+            # Nothing was built for this solve
+            fn.build_time = 0
+            fn.stats = None
+            fn.should_stop = None
+            return fn
+
+        self.misses += 1
+        fn = CompactFlowNetwork(preferences, officers_per_org, min_shifts, max_shifts, aggregate=aggregate, days=days,
+                                shifts=shifts, **options)
+        self.networks[key] = fn
+        self.arcs += 2 * fn.edge_count
+        self.evict()
+        return fn
+
+    def key(self, preferences, company_count, days, shifts, aggregate):
+        """
+        Returns the structure of a network as a hashable key
+
+        Time complexity:
+            Best case analysis: O(N) where N is the number of officers
+            Worst case analysis: O(N) where N is the number of officers
+        """
+        return company_count, days, shifts, aggregate, tuple(tuple(officer) for officer in preferences)
+
+    def evict(self):
+        """
+        Drops the least recently used networks until the cache is within its limits (the newest network is always kept)
+        """
+        while len(self.networks) > 1 and (len(self.networks) > self.max_entries or
+                                          (self.max_arcs is not None and self.arcs > self.max_arcs)):
+            _, fn = self.networks.popitem(last=False)
+            self.arcs -= 2 * fn.edge_count
+
+    def clear(self):
+        """
+        Drops every network
+        """
+        self.networks.clear()
+        self.arcs = 0